@@ -1,4 +1,5 @@
 import threading
+from contextlib import contextmanager
 
 import cv2
 import torch
@@ -7,15 +8,24 @@ from starlette.websockets import WebSocket, WebSocketDisconnect
 
 import config
 from typing import Union, Callable, List
-from ultralytics import YOLO
 from fastapi import FastAPI
-from time import sleep
+from time import sleep, monotonic
 
 from src.core.Android.app import Android_App
 from src.core.CLIP_services.services import CLIPServiceManager
 from src.core.Web.routers import register_routes
 from src.core.Web.websocket import WebSocketManager
 from src.core.Windows.app import Windows_App
+from src.core.inference.backends import YoloBackend
+from src.core.inference.frame_gate import FrameChangeDetector
+from src.core.inference.fused import FusedInference
+from src.core.inference.governor import RateGovernor
+from src.core.inference.model_registry import ModelRegistry
+from src.core.inference.pipeline import DropOldestQueue, FramePipeline, PipelineStage
+from src.core.inference.scope import DetectionScope
+from src.core.inference.tracker import BoxTracker
+from src.core.inference.frame_buffer import FrameRingBuffer, FrameSnapshot
+from src.core.inference.detection_events import DetectionEventBus, DetectionDiff
 from src.core.middlewares.middleware_register import register_middlewares
 from src.core.tasks.base_ui.start_game import action__click_start_game, handle__network_error_modal_boxes, \
     action__check_home_tab_exist
@@ -26,32 +36,41 @@ from src.entity.Game.Page.Types.index import GamePageTypes
 from src.entity.WebSocket_Data import WebSocket_Data
 from src.core.task import TaskQueue
 from src.entity.Yolo import YoloModelType, Yolo_Results
-from src.utils.game_tools import get_current_location
+from src.utils.game_tools import get_current_location, CURRENT_LOCATION_SCOPE
 from src.utils.logger import logger
+from src.utils.ocr_instance import init_ocr_pool, init_ocr_cache
 
 from src.constants import *
-from src.utils.yolo_tools import get_modal
+from src.utils.yolo_tools import get_modal, MODAL_SCOPE
+from src.utils.selector import Selector, as_selector
 
 
 class AppProcessor:
     # 推理设备
     device: str
-    # Yolo模型
-    model: YOLO
+    # 常驻模型注册表
+    model_registry: ModelRegistry
+    # 融合推理（多个模型同帧推理）
+    fused_inference: FusedInference | None = None
     # 操作设备
     app: Android_App | Windows_App
     # 当前Yolo模型
     current_model_type: str
-    # 最新帧
-    latest_frame: np.array = None
-    # 最新推理结果
-    latest_results: Yolo_Results | None = None
+    # 最新帧快照（帧、推理结果、序号、捕获时间），由推理阶段整体替换发布，
+    # 任务线程每一步读取一次即可得到同一帧的图像与结果，无需加锁
+    snapshot: FrameSnapshot | None = None
+    # 最近若干帧的快照（帧、推理结果、捕获时间、序号）
+    frame_buffer: FrameRingBuffer
+    # 检测变化事件总线（相邻两次推理结果的目标框出现 / 消失 / 移动），Debug模式下输出到日志
+    detection_events: DetectionEventBus
     # 任务队列
     task_queue: TaskQueue
     # 捕获帧状态
     running: bool = False
-    # 捕获帧线程
-    capture_thread: threading.Thread = None
+    # 模型预热完成标志（预热完成前不处理帧、不执行任务）
+    ready: bool = False
+    # 帧处理流水线（捕获 → 推理 → 发布 / 中间件）
+    pipeline: FramePipeline = None
     # 暂停捕获帧标志
     _pause_capture_frame: bool = False
     # 中间件注册列表
@@ -60,44 +79,158 @@ class AppProcessor:
     game_status_manager: GameStatusManager
     # 图像记忆管理器
     clip_manager: CLIPServiceManager
+    # 帧变化检测器（静态帧跳过推理）
+    frame_change_detector: FrameChangeDetector | None = None
+    # 帧率调节器
+    rate_governor: RateGovernor | None = None
+    # 目标框跟踪器（跟踪模式）
+    box_tracker: BoxTracker | None = None
 
     def __init__(self):
+        self.frame_buffer = FrameRingBuffer(config.frame_buffer_size)
+        init_ocr_pool(config.ocr_pool_size)
+        init_ocr_cache(config.ocr_cache_size, config.ocr_cache_persist)
+        self.detection_events = DetectionEventBus(
+            config.detection_event_move_threshold,
+            config.detection_event_match_distance,
+            config.detection_event_queue_size
+        )
+        if config.debug:
+            self.detection_events.subscribe(self._log_detection_diff)
         self.app = self._create_app_instance()
         self.device = self._detect_device()
+        if config.frame_change_detection:
+            self.frame_change_detector = FrameChangeDetector(
+                config.frame_change_threshold,
+                config.frame_change_sample_size,
+                config.frame_change_max_skip,
+                config.frame_change_grid
+            )
+        if config.tracking:
+            self.box_tracker = BoxTracker(config.tracking_detect_interval, config.tracking_iou_threshold)
+        self.model_registry = ModelRegistry(config.model_config, self.device, config.model_memory_budget_mb)
         self.load_model()
+        if config.fused_inference:
+            self.fused_inference = FusedInference(self.model_registry, config.fused_model_types)
         self._middleware_registry = []
         self.task_queue = TaskQueue(self)
+        if config.rate_governor:
+            self.rate_governor = RateGovernor(
+                config.governor_fps,
+                config.governor_viewer_fps,
+                self.task_queue.is_running,
+                lambda: bool(ws_manager.active_connections)
+            )
         self.game_status_manager = GameStatusManager()
         self.clip_manager = CLIPServiceManager()
         register_tasks(self)
         register_middlewares(self)
+        threading.Thread(target=logger.catch(self._warmup_models), daemon=True).start()
         self.start()
         logger.success("Application Initialized")
 
+    def _warmup_models(self):
+        """预热阶段：使用实际捕获分辨率的合成帧预热所有常驻模型，完成后标记为就绪"""
+        frame = self.app.capture()
+        if frame is not None and frame.size > 0:
+            shape = frame.shape[:2]
+        else:
+            width, height = config.warmup_resolution
+            shape = (height, width)
+        # 开启内存预算时只预热当前模型，避免预热过程淘汰模型
+        model_types = None if config.model_memory_budget_mb is None else [self.model_registry.active_type]
+        if self.fused_inference:
+            model_types = self.fused_inference.model_types
+        self.model_registry.warmup(shape, config.warmup_iterations, model_types)
+        self.ready = True
+        logger.success("Models warmed up, application ready")
+
+    @property
+    def latest_frame(self) -> np.ndarray | None:
+        """最新帧（与 latest_results 分别读取时可能来自不同帧，需要配对使用时请读取 snapshot）"""
+        snapshot = self.snapshot
+        return snapshot.frame if snapshot else None
+
+    @property
+    def latest_results(self) -> Yolo_Results | None:
+        """最新推理结果"""
+        snapshot = self.snapshot
+        return snapshot.results if snapshot else None
+
+    @property
+    def model(self) -> YoloBackend:
+        """当前Yolo模型推理后端"""
+        return self.model_registry.active
+
+    def get_latency_report(self) -> dict:
+        """获取推理延迟统计（融合推理时同时包含合并延迟与各模型单独延迟）"""
+        if self.fused_inference:
+            return self.fused_inference.get_latency_report()
+        return {
+            model_type: backend.latency.to_dict()
+            for model_type in self.model_registry.get_loaded_types()
+            if (backend := self.model_registry.get(model_type))
+        }
+
     def load_model(self, model_type: str = YoloModelType.BASE_UI):
         """
-        加载指定类型的Yolo模型
+        切换到指定类型的Yolo模型（模型常驻时仅替换引用，不会暂停帧处理流水线）
         :param model_type:
         :return:
         """
-        def _init(model_type: str):
-            logger.debug(f"Loading YOLO model {model_type}...")
-            model_config = config.model_config.get(model_type)
-            model = YOLO(model_config.get("model_path")).to(self.device).eval()
-            model.conf = model_config.get("conf_threshold")
-            model.iou = model_config.get("iou_threshold")
-            model.half = torch.cuda.is_available()
-            logger.info(f"Model size: {model.overrides.get('imgsz', 640)}")
-            return model
-
         if model_type in [YoloModelType.BASE_UI, YoloModelType.PRODUCER]:
-            self.pause_capture_frame()
-            self.model = _init(model_type)
+            self.model_registry.switch(model_type)
             self.current_model_type = model_type
-            self.resume_capture_frame()
+            self._reset_inference_state()
         else:
             raise ValueError(f'Unknown model type: {model_type}')
 
+    def detect(self, scope: DetectionScope, snapshot: FrameSnapshot | None = None) -> Yolo_Results:
+        """
+        按检测范围获取一帧的检测结果，只作用于本次调用，流水线的整帧推理、中间件及其他任务不受影响。
+        范围没有裁剪区域时直接按标签筛选快照中已有的推理结果（不重复推理）；
+        有裁剪区域时在调用方线程中只对该区域推理
+
+        用法：
+            results = app.detect(DetectionScope((0, 0.8, 1, 1), [base_labels.tab_home], relative=True, name="home_tab"))
+        :param scope: 检测范围（结果的 results.scope 为该范围，可通过 scope.name 区分请求方）
+        :param snapshot: 帧快照，为None时使用最新快照
+        :return: 检测结果，还没有捕获到帧时返回空结果
+        """
+        snapshot = snapshot or self.snapshot
+        if snapshot is None:
+            results = Yolo_Results.from_boxes([])
+        elif scope.region is None:
+            results = snapshot.results
+            results = results._copy() if scope.labels is None else results.filter_by_labels(scope.labels)
+        elif self.fused_inference:
+            return self.fused_inference.infer(snapshot.frame, scope)
+        else:
+            return self.model.infer(snapshot.frame, scope)
+        results.scope = scope
+        return results
+
+    @contextmanager
+    def _boost_rate(self):
+        """等待检测结果期间全速捕获推理"""
+        if self.rate_governor is None:
+            yield
+            return
+        with self.rate_governor.boost():
+            yield
+
+    def _wake_capture(self):
+        """唤醒因帧率调节而休眠的捕获阶段"""
+        if self.rate_governor:
+            self.rate_governor.wake()
+
+    def _reset_inference_state(self):
+        """清除帧变化检测与跟踪状态，下一帧必定完整推理（切换模型时调用）"""
+        if self.frame_change_detector:
+            self.frame_change_detector.reset()
+        if self.box_tracker:
+            self.box_tracker.reset()
+
     def register_task(self, task_name: str, description: str, timeout: int | None = None):
         """实例方法：注册任务"""
         logger.debug(f"register task: {task_name}")
@@ -120,14 +253,14 @@ class AppProcessor:
         if self.running and not self._pause_capture_frame:
             logger.debug("Pause capture frame......")
             self._pause_capture_frame = True
-            self.capture_thread.join()
+            self._wake_capture()
+            self.pipeline.stop()
             logger.debug("Paused capture frame")
 
     def resume_capture_frame(self):
         if self.running and self._pause_capture_frame:
             self._pause_capture_frame = False
-            self.capture_thread = threading.Thread(target=self._capture_and_infer, daemon=True)
-            self.capture_thread.start()
+            self.pipeline.start()
             logger.debug("Resumed capture frame")
 
     @staticmethod
@@ -149,118 +282,198 @@ class AppProcessor:
             return Windows_App(config.window_name)
         raise ValueError(f"Invalid mode: {config.mode}")
 
-    def _capture_and_infer(self):
-        while self.running and not self._pause_capture_frame:
-            frame = self.app.capture()
-            if frame is None or frame.size <= 0:
-                sleep(0.5)
-                continue
-            self.latest_frame = frame
-            results = self.model(frame, imgsz=self.model.args['imgsz'] if hasattr(self.model, 'args') else 640, verbose=False, stream=True)
-            self.latest_results = Yolo_Results(results, self.model, self.latest_frame)
-            self._send_frame_to_clients()
+    def _create_pipeline(self) -> FramePipeline:
+        """
+        构建帧处理流水线：捕获、推理、发布、中间件四个阶段各自运行在独立线程，
+        阶段之间使用丢弃最旧帧的有界队列，慢速的调试客户端或中间件不会拖慢检测
+        """
+        infer_queue = DropOldestQueue(config.pipeline_queue_size)
+        publish_queue = DropOldestQueue(config.pipeline_queue_size)
+        middleware_queue = DropOldestQueue(config.pipeline_queue_size)
+        return FramePipeline([
+            PipelineStage("capture", self._stage__capture, output_queues=[infer_queue]),
+            PipelineStage("infer", self._stage__infer, infer_queue, [publish_queue, middleware_queue]),
+            PipelineStage("publish", self._stage__publish, publish_queue),
+            PipelineStage("middleware", self._stage__middleware, middleware_queue),
+        ])
+
+    def _stage__capture(self):
+        """流水线阶段：捕获帧"""
+        if self.rate_governor:
+            self.rate_governor.throttle()
+        frame = self.app.capture()
+        if frame is None or frame.size <= 0:
+            sleep(0.5)
+            return None
+        return frame, monotonic()
+
+    def _stage__infer(self, item):
+        """流水线阶段：推理并更新最新结果"""
+        frame, timestamp = item
+        if not self.ready:
+            return None
+        results = self.latest_results
+        # 画面无明显变化时复用上一次的推理结果
+        if (results is None or self.frame_change_detector is None
+                or self.frame_change_detector.is_changed(frame)):
+            scene_changed = (self.frame_change_detector is not None and
+                             self.frame_change_detector.last_mean_diff >= config.tracking_scene_change_threshold)
+            if self.box_tracker and not self.box_tracker.need_detection(scene_changed):
+                results = self.box_tracker.track(frame)
+            else:
+                if self.fused_inference:
+                    results = self.fused_inference.infer(frame)
+                else:
+                    results = self.model.infer(frame)
+                if self.box_tracker:
+                    results = self.box_tracker.update_detection(results, frame)
+        # 帧与结果作为一个不可变快照，通过一次引用赋值发布
+        self.snapshot = self.frame_buffer.append(frame, results, timestamp)
+        # 在推理阶段对每个推理结果做差分（发布队列会丢弃快照，在下游做差分会漏掉中间的变化）
+        self.detection_events.publish(self.snapshot)
+        return self.snapshot
+
+    @staticmethod
+    def _log_detection_diff(diff: DetectionDiff):
+        """调试：输出检测变化"""
+        logger.debug(
+            f"Detection changed #{diff.seq}: appeared {len(diff.appeared)}, disappeared {len(diff.disappeared)}, "
+            f"moved {len(diff.moved)}, labels +{sorted(diff.labels_appeared)} -{sorted(diff.labels_disappeared)}"
+        )
+
+    def _stage__publish(self, snapshot: FrameSnapshot):
+        """流水线阶段：向调试客户端推送画面"""
+        if not ws_manager.active_connections:
+            return
+        self._send_frame_to_clients(snapshot.frame, snapshot.results)
+
+    def _stage__middleware(self, snapshot: FrameSnapshot):
+        """流水线阶段：执行中间件"""
+        self._exec_middleware(snapshot)
 
     @logger.catch
-    def _send_frame_to_clients(self):
-        """将最新的图像的二进制数据发送给 WebSocket 客户端。"""
-        if self.latest_frame is None:
+    def _send_frame_to_clients(self, frame: np.ndarray, results: Yolo_Results):
+        """将图像的二进制数据发送给 WebSocket 客户端。"""
+        if frame is None:
             return
         # 获取图像尺寸
-        height, width = self.latest_frame.shape[:2]
-        if not self.latest_results.results:
-            _, encoded_frame = cv2.imencode('.jpg', self.latest_frame)
-            frame_bytes = encoded_frame.tobytes()
-            ws_manager.broadcast_sync(WebSocket_Data(None, f"{width},{height}".encode('utf-8') + b"," + frame_bytes))
-        for result in self.latest_results.results:
+        height, width = frame.shape[:2]
+        annotated_frame = frame
+        # 融合推理时包含多个模型的结果，依次绘制在同一帧上
+        for result in results.results:
             annotated_frame = result.plot(
                 conf=False,
                 line_width=max(1, int(height / 600)),
                 font_size=max(0.5, height / 1200),
-                pil=False
+                pil=False,
+                img=annotated_frame
             )
-            _, encoded_frame = cv2.imencode('.jpg', annotated_frame)
-            frame_bytes = encoded_frame.tobytes()
-            ws_manager.broadcast_sync(WebSocket_Data(None, f"{width},{height}".encode('utf-8') + b"," + frame_bytes))
-            self._exec_middleware()
+        _, encoded_frame = cv2.imencode('.jpg', annotated_frame)
+        frame_bytes = encoded_frame.tobytes()
+        ws_manager.broadcast_sync(WebSocket_Data(None, f"{width},{height}".encode('utf-8') + b"," + frame_bytes))
 
-    def _exec_middleware(self):
-        """注册处理中间件"""
+    def _exec_middleware(self, snapshot: FrameSnapshot):
+        """
+        注册处理中间件
+        :param snapshot: 当前流水线处理的帧快照，中间件应基于该快照而非 self.snapshot 处理
+        """
         for func in self._middleware_registry:
-            func(self)
+            func(self, snapshot)
 
-    def wait_for_label(self, label, timeout=30, interval=1, continuous=1):
-        """等待指定标签的框出现"""
-        wait_time = 0
-        count = 0
+    @staticmethod
+    def _query(results: Yolo_Results, label: str | Selector) -> Yolo_Results:
+        """按标签、选择器文本或选择器查询目标框"""
+        if (selector := as_selector(label)) is not None:
+            return selector.select(results)
+        return results.filter_by_label(label)
+
+    def wait_for_label(self, label: str | Selector, timeout=30, interval=1, continuous=1,
+                       scope: DetectionScope | None = None, min_span: float = 0):
+        """
+        等待指定标签（或选择器文本 / Selector 匹配）的框出现
+        只检查调用之后推理的帧，标签需在连续 continuous + 1 帧中出现；
+        interval 为原轮询间隔，按新帧等待后已不需要，仅为兼容保留
+        指定检测范围时只检查范围内的结果（有裁剪区域时在当前线程中对最新快照按范围推理），不影响流水线与其他任务
+        :param min_span: 连续出现的最短持续时间（秒），用于过滤一闪而过的目标，默认只按帧数判断
+        """
         logger.debug(f"waiting label: {label}")
-        while wait_time <= timeout:
-            if count > continuous:
-                return True
-            if self.latest_results.filter_by_label(label):
-                count += 1
-                sleep(0.3)
-                continue
-            else:
-                count = 0
-            sleep(interval)
-            wait_time += interval
-        return False
+        if (selector := as_selector(label)) is not None:
+            predicate = selector.select
+        else:
+            predicate = lambda results: results.exists_label(label)
+        key = None if scope is None else (lambda snapshot: self.detect(scope, snapshot))
+        with self._boost_rate():
+            snapshot = self.frame_buffer.wait_for(
+                predicate,
+                timeout,
+                consecutive=continuous + 1,
+                newest=scope is not None and scope.region is not None,
+                key=key,
+                min_span=min_span
+            )
+        return snapshot is not None
 
     def wait_for_modal(self, modal_title, timeout=30, interval=1, no_body: bool = False):
         """等待指定标题的模态框出现"""
         logger.debug(f"Waiting for modal with title: {modal_title}")
-        wait_time = 0
-
-        while wait_time < timeout:
-            headers = self.latest_results.filter_by_label(base_labels.modal_header)
-            buttons = self.latest_results.filter_by_label(base_labels.button)
-
-            if not (headers and buttons):
-                logger.debug(f"No modal header or button found, waiting... ({wait_time}/{timeout})")
-            else:
-                modal = get_modal(self.latest_results, self.latest_frame, no_body)
-                if modal:
-                    if modal_title is None or modal_title in modal.modal_title:
-                        logger.debug(f"Modal found: {modal.modal_title}")
-                        return modal
-                    else:
-                        logger.debug(f"Modal title '{modal.modal_title}' does not match '{modal_title}'")
-
-            sleep(interval)
-            wait_time += interval
+        deadline = monotonic() + timeout
+        # 从当前最新帧开始检查，之后每次只检查最新的帧（识别模态框需要OCR，开销较大）
+        seq = self.frame_buffer.latest_seq - 1
+
+        with self._boost_rate():
+            while (remaining := deadline - monotonic()) > 0:
+                snapshot = self.frame_buffer.wait_newer(seq, remaining, newest=True)
+                if snapshot is None:
+                    break
+                seq = snapshot.seq
+                headers = snapshot.results.filter_by_label(base_labels.modal_header)
+                buttons = snapshot.results.filter_by_label(base_labels.button)
+
+                if not (headers and buttons):
+                    logger.debug(f"No modal header or button found, waiting... ({timeout - remaining:.1f}/{timeout})")
+                else:
+                    modal = get_modal(self.detect(MODAL_SCOPE, snapshot), snapshot.frame, no_body)
+                    if modal:
+                        if modal_title is None or modal_title in modal.modal_title:
+                            logger.debug(f"Modal found: {modal.modal_title}")
+                            return modal
+                        else:
+                            logger.debug(f"Modal title '{modal.modal_title}' does not match '{modal_title}'")
 
         logger.warning(f"Timeout reached ({timeout}s): modal with title '{modal_title}' not found.")
         return False
 
-    def click_on_label(self, label, timeout=10, interval=1):
-        """等待指定标签并点击"""
+    def click_on_label(self, label: str | Selector, timeout=10, interval=1, scope: DetectionScope | None = None):
+        """等待指定标签（或选择器文本 / Selector 匹配）的框并点击（指定检测范围时在当前线程中按范围推理最新帧）"""
         wait_time = 0
         count = 0
         logger.debug(f"waiting click label: {label}")
-        while wait_time < timeout:
-            boxs = self.latest_results.filter_by_label(label)
-            if boxs:
-                self.app.click_element(boxs.first())
-                return True
-            else:
-                count += 1
-                if count >= 3:
-                    break
-                sleep(interval)
-            wait_time += interval
+        with self._boost_rate():
+            while wait_time < timeout:
+                results = self.latest_results if scope is None else self.detect(scope)
+                boxs = self._query(results, label)
+                if boxs:
+                    self.app.click_element(boxs.first())
+                    return True
+                else:
+                    count += 1
+                    if count >= 3:
+                        break
+                    sleep(interval)
+                wait_time += interval
         return False
 
     def wait__loading(self, timeout=60):
         """等待加载"""
-        COUNT = 0
         sleep(3)
-        while COUNT < timeout:
+        with self._boost_rate():
             logger.debug("Waiting for loading")
-            if self.latest_results.filter_by_label(base_labels.general_loading1) or self.latest_results.filter_by_label(
-                    base_labels.general_loading2):
-                sleep(1)
-                COUNT += 1
-            else:
+            if self.frame_buffer.wait_for(
+                    lambda results: not (results.exists_label(base_labels.general_loading1)
+                                         or results.exists_label(base_labels.general_loading2)),
+                    timeout,
+                    after_seq=self.frame_buffer.latest_seq - 1
+            ):
                 logger.debug("Wait for the loading to finish")
                 return True
         raise TimeoutError("Waiting for a load timeout")
@@ -272,14 +485,17 @@ class AppProcessor:
 
     def wait__button(self, text, timeout=10):
         """等待指定文字按钮"""
-        COUNT = 0
-        while COUNT < timeout:
-            buttons = ButtonList(self.latest_results)
-            print(buttons)
-            if button := buttons.get_button_by_text(text):
-                return button
-            sleep(1)
-            COUNT += 1
+        deadline = monotonic() + timeout
+        seq = self.frame_buffer.latest_seq - 1
+        with self._boost_rate():
+            while (remaining := deadline - monotonic()) > 0:
+                # 按钮文字需要OCR，每次只检查最新的帧
+                snapshot = self.frame_buffer.wait_newer(seq, remaining, newest=True)
+                if snapshot is None:
+                    break
+                seq = snapshot.seq
+                if button := ButtonList(snapshot.results).get_button_by_text(text):
+                    return button
         raise TimeoutError(f"Waiting for {text} button timeout")
 
     def go_home(self):
@@ -292,12 +508,13 @@ class AppProcessor:
                 value for name, value in vars(GamePageTypes).items()
                 if name.startswith("MAIN_MENU__")
             ]
+            results = self.latest_results
             if self.game_status_manager.current_location in main_menu_items:
-                self.app.click_element(self.latest_results.filter_by_label(base_labels.tab_home).first())
+                self.app.click_element(results.filter_by_label(base_labels.tab_home).first())
                 self.wait__loading()
                 self.update_current_location()
                 return
-            elif go_home_btn := self.latest_results.filter_by_label(base_labels.go_home_btn):
+            elif go_home_btn := results.filter_by_label(base_labels.go_home_btn):
                 self.app.click_element(go_home_btn.first())
                 self.wait__loading()
                 self.update_current_location()
@@ -313,12 +530,17 @@ class AppProcessor:
         else:
             raise TimeoutError("Waiting for a back button timeout")
 
-    def update_current_location(self, location: str = None):
+    def update_current_location(self, location: str = None, snapshot: FrameSnapshot | None = None):
+        """
+        更新当前位置
+        :param location: 指定位置，为空时根据检测结果识别
+        :param snapshot: 用于识别的帧快照，默认使用最新快照
+        """
         logger.debug("Updating current location......")
         if location:
             self.game_status_manager.current_location = location
         else:
-            current_location = get_current_location(self.latest_results)
+            current_location = get_current_location(self.detect(CURRENT_LOCATION_SCOPE, snapshot))
             if current_location and current_location != self.game_status_manager.current_location:
                 self.game_status_manager.current_location = current_location
         logger.debug(f"Current location: {self.game_status_manager.current_location}")
@@ -326,23 +548,29 @@ class AppProcessor:
     def start(self):
         if not self.running or self._pause_capture_frame:
             self.running = True
-            self.capture_thread = threading.Thread(target=self._capture_and_infer, daemon=True)
-            self.capture_thread.start()
-            logger.success("Started inference thread.")
+            self._pause_capture_frame = False
+            if self.pipeline is None:
+                self.pipeline = self._create_pipeline()
+            self.pipeline.start()
+            logger.success("Started inference pipeline.")
 
     def stop(self):
         if self.running:
             self.running = False
-            self.capture_thread.join(timeout=3)
-            logger.success("Stopped inference thread.")
+            self._wake_capture()
+            self.pipeline.stop(timeout=3)
+            logger.success("Stopped inference pipeline.")
 
     def exec_task(self):
-        self.task_queue.exec_task()
+        if not self.ready:
+            logger.warning("Models are warming up, task execution is not available yet")
+            return False
+        return self.task_queue.exec_task()
 
 
 app = FastAPI()
-processor = AppProcessor()
 ws_manager = WebSocketManager()
+processor = AppProcessor()
 
 register_routes(app, processor, ws_manager)
 
@@ -11,14 +11,76 @@ debug = True
 # Debug模式预览窗口名
 debug_window_name = f"{window_name} yolo debug"
 
+# 静态帧跳过推理（画面无明显变化时复用上一次的推理结果）
+frame_change_detection = True
+# 帧变化阈值：下采样灰度图按网格分块后，变化最大的分块的平均像素差（0-255），不超过该值视为静态帧
+frame_change_threshold = 4.0
+# 帧变化检测的下采样尺寸（宽, 高）
+frame_change_sample_size = (160, 90)
+# 帧变化检测的分块数量（列, 行），分块越小越能检测到局部的小变化
+frame_change_grid = (16, 9)
+# 最大连续跳过推理帧数，超过后强制推理一次（0 表示不限制）
+frame_change_max_skip = 30
+# 根据任务状态调节捕获/推理帧率（空闲实例几乎不占用CPU）
+rate_governor = True
+# 各状态下的目标帧率：IDLE 无任务，RUNNING 任务执行中，WAITING 任务等待检测结果（None 表示不限速）
+governor_fps = {
+    "IDLE": 0.5,
+    "RUNNING": 10,
+    "WAITING": None,
+}
+# 有调试客户端（WebSocket）连接时的最低帧率
+governor_viewer_fps = 10
+# 跟踪模式：每 N 帧运行一次完整检测，中间帧使用光流平移目标框
+tracking = False
+# 完整检测间隔帧数
+tracking_detect_interval = 3
+# 画面突变阈值（帧变化检测的整帧平均像素差），超过时立即完整检测
+tracking_scene_change_threshold = 12.0
+# 检测帧之间关联同一目标的最小 IoU
+tracking_iou_threshold = 0.3
+# 帧快照环形缓冲区容量（帧数），等待检测结果的逻辑基于此查询
+frame_buffer_size = 30
+# 流水线阶段间队列容量（队列满时丢弃最旧的帧）
+pipeline_queue_size = 1
+# 检测变化事件：中心点移动超过该距离（像素）的目标框视为移动
+detection_event_move_threshold = 4
+# 检测变化事件：前后两帧同标签目标框中心点距离不超过该值（像素）时视为同一目标
+detection_event_match_distance = 80
+# 检测变化事件流的队列容量（消费者处理不及时时丢弃最旧的事件）
+detection_event_queue_size = 64
+
+# OCR引擎池容量（进程内共享的 PaddleOCR 实例数，并发调用者超过该数量时排队等待）
+ocr_pool_size = 2
+# OCR结果缓存容量（按裁剪图内容哈希缓存识别结果），0 表示不缓存
+ocr_cache_size = 2048
+# 是否将OCR结果缓存保存到 model/OCR，重启后继续使用
+ocr_cache_persist = False
+
+# 模型常驻内存预算（MB），超出时淘汰最久未使用的模型；None 表示所有模型常驻
+model_memory_budget_mb = None
+
+# 融合推理：在同一帧上同时运行多个模型并合并结果（开启后忽略模型切换）
+fused_inference = False
+# 参与融合推理的模型
+fused_model_types = [YoloModelType.BASE_UI, YoloModelType.PRODUCER]
+
+# 启动时每个模型的预热推理次数
+warmup_iterations = 3
+# 无法获取捕获帧时预热使用的分辨率（宽, 高）
+warmup_resolution = (1920, 1080)
+
+# Yolo模型配置，backend 可选 "torch"（ultralytics + PyTorch）或 "onnx"（ONNX Runtime，首次加载时自动导出）
 model_config = {
     YoloModelType.BASE_UI: {
         "model_path": "model/base_ui.pt",
+        "backend": "torch",
         "conf_threshold": 0.5,
         "iou_threshold": 0.5
     },
     YoloModelType.PRODUCER: {
         "model_path": "model/producer.pt",
+        "backend": "torch",
         "conf_threshold": 0.5,
         "iou_threshold": 0.5
     },
@@ -1,5 +1,7 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from src.core.Web.websocket import WebSocketManager
+from src.entity.Yolo import get_frame_memory_report
+from src.utils.ocr_instance import get_ocr_cache
 from time import sleep
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -28,7 +30,22 @@ def register_routes(app: FastAPI, processor: "AppProcessor", ws_manager: WebSock
 
     @app.get("/status")
     def get_status():
-        return {'status': processor.running}
+        detector = processor.frame_change_detector
+        governor = processor.rate_governor
+        ocr_cache = get_ocr_cache()
+        return {
+            'status': processor.running,
+            'ready': processor.ready,
+            'warmup': processor.model_registry.get_warmup_timings(),
+            'model': processor.model_registry.active_type,
+            'loaded_models': processor.model_registry.get_loaded_types(),
+            'latency': processor.get_latency_report(),
+            'frame_skip_ratio': round(detector.skip_ratio, 4) if detector else None,
+            'frame_memory': get_frame_memory_report(),
+            'ocr_cache': ocr_cache.get_stats() if ocr_cache is not None else None,
+            'detection_ratio': round(processor.box_tracker.detection_ratio, 4) if processor.box_tracker else None,
+            'governor': {'state': governor.state, 'target_fps': governor.target_fps} if governor else None
+        }
 
     @app.get("/get_registered_tasks")
     def get_registered_tasks():
@@ -0,0 +1,243 @@
+import ast
+import math
+import os
+import threading
+from abc import ABC, abstractmethod
+from time import perf_counter
+from typing import Tuple
+
+import numpy as np
+from ultralytics import YOLO
+
+from src.core.inference.latency import LatencyMeter
+from src.core.inference.scope import DetectionScope
+from src.entity.Yolo import Yolo_Results
+from src.utils.logger import logger
+
+
+class YoloBackend(ABC):
+    """
+    Yolo推理后端基类。
+
+    不同后端输出相同的 ultralytics Results 对象，可直接用于构建 Yolo_Results。
+
+    Attributes:
+        model_type: 模型类型（YoloModelType）。
+        model_path: .pt 模型路径。
+        model_config: config.model_config 中的模型配置。
+        device: 推理设备。
+        model: ultralytics 模型实例。
+        imgsz: 推理输入尺寸。
+        latency: 单帧推理延迟统计。
+        warmup_timings: 预热耗时统计。
+
+    流水线线程与任务线程（按范围检测）可能同时推理，推理过程由 _lock 串行化。
+    """
+    name: str = ""
+    model_type: str
+    model_path: str
+    model_config: dict
+    device: str
+    model: YOLO = None
+    imgsz: int | tuple = 640
+    latency: LatencyMeter
+    warmup_timings: dict | None = None
+    _lock: threading.Lock
+
+    def __init__(self, model_type: str, model_config: dict, device: str):
+        self.model_type = model_type
+        self.model_path = model_config.get("model_path")
+        self.model_config = model_config
+        self.device = device
+        self.latency = LatencyMeter()
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> dict:
+        """类别ID → 标签名"""
+        return self.model.names
+
+    @abstractmethod
+    def load(self) -> "YoloBackend":
+        """加载模型"""
+
+    @abstractmethod
+    def memory_footprint(self) -> int:
+        """估算模型常驻内存（字节）"""
+
+    def _predict_kwargs(self, kwargs: dict) -> dict:
+        """
+        补全推理参数（输入尺寸）
+        模型配置中的 conf_threshold / iou_threshold 未传入推理，各后端均使用 ultralytics 默认阈值，与原有检测结果保持一致
+        """
+        kwargs.setdefault("imgsz", self.imgsz)
+        return kwargs
+
+    def predict(self, frame: np.ndarray, **kwargs):
+        """
+        推理单帧
+        :param frame: 图像帧
+        :param kwargs: 额外的 ultralytics 推理参数
+        :return: Results 生成器
+        """
+        return self.model(frame, verbose=False, stream=True, **self._predict_kwargs(kwargs))
+
+    def warmup(self, shape: Tuple[int, int], iterations: int = 1) -> dict:
+        """
+        使用合成帧预热模型，完成计算图初始化、内存分配与算子选择
+        :param shape: 合成帧尺寸 (高, 宽)，应与实际捕获分辨率一致
+        :param iterations: 预热次数
+        :return: 预热耗时统计
+        """
+        frame = np.random.randint(0, 256, (shape[0], shape[1], 3), dtype=np.uint8)
+        timings = []
+        for _ in range(max(1, iterations)):
+            with self._lock:
+                start = perf_counter()
+                list(self.predict(frame))
+                timings.append((perf_counter() - start) * 1000)
+        # 模型加载后的第一次推理耗时（冷启动）
+        cold_ms = self.warmup_timings["cold_ms"] if self.warmup_timings else timings.pop(0)
+        self.warmup_timings = {
+            "shape": list(shape),
+            "cold_ms": round(cold_ms, 2),
+            "warm_ms": round(min(timings), 2) if timings else None,
+            "iterations": (self.warmup_timings["iterations"] if self.warmup_timings else 0) + max(1, iterations),
+        }
+        return self.warmup_timings
+
+    def get_scope_imgsz(self, crop: np.ndarray) -> int | tuple:
+        """
+        裁剪区域推理时的输入尺寸：与裁剪区域大小匹配（按32对齐），且不超过模型输入尺寸
+        :param crop: 裁剪后的图像
+        :return:
+        """
+        max_size = max(self.imgsz) if isinstance(self.imgsz, (list, tuple)) else self.imgsz
+        size = min(max(crop.shape[:2]), max_size)
+        return max(32, math.ceil(size / 32) * 32)
+
+    def __call__(self, frame: np.ndarray, **kwargs):
+        return self.predict(frame, **kwargs)
+
+    def infer(self, frame: np.ndarray, scope: DetectionScope | None = None, **kwargs) -> Yolo_Results:
+        """
+        推理单帧并封装为 Yolo_Results，同时记录推理延迟
+        :param frame: 图像帧
+        :param scope: 检测范围，只在裁剪区域内推理并按类别过滤，框坐标映射回完整帧
+        :param kwargs: 额外的 ultralytics 推理参数
+        :return: 推理结果，按范围推理时 results.scope 为该范围
+        """
+        if scope is None:
+            with self._lock, self.latency:
+                return Yolo_Results(self.predict(frame, **kwargs), self, frame)
+        classes = scope.resolve_classes(self.names)
+        if classes is not None:
+            if not classes:
+                # 当前模型不包含任何指定标签
+                results = Yolo_Results.from_boxes([])
+                results.scope = scope
+                return results
+            kwargs["classes"] = classes
+        height, width = frame.shape[:2]
+        region = scope.resolve_region(width, height)
+        image = frame
+        if region:
+            x1, y1, x2, y2 = region
+            image = frame[y1:y2, x1:x2]
+            kwargs["imgsz"] = self.get_scope_imgsz(image)
+        with self._lock, self.latency:
+            results = Yolo_Results(self.predict(image, **kwargs), self, frame, region)
+        results.scope = scope
+        return results
+
+
+class TorchBackend(YoloBackend):
+    """PyTorch（ultralytics eager）推理后端"""
+    name = "torch"
+
+    def load(self) -> "TorchBackend":
+        model = YOLO(self.model_path).to(self.device).eval()
+        self.model = model
+        self.imgsz = model.args['imgsz'] if hasattr(model, 'args') else 640
+        logger.info(f"Model size: {model.overrides.get('imgsz', 640)}")
+        return self
+
+    def memory_footprint(self) -> int:
+        return sum(p.numel() * p.element_size() for p in self.model.model.parameters())
+
+
+class OnnxBackend(YoloBackend):
+    """
+    ONNX Runtime 推理后端。
+
+    首次加载时将 .pt 模型导出为 .onnx（模型文件更新后会重新导出），之后直接加载 .onnx 文件。
+    """
+    name = "onnx"
+    onnx_path: str
+
+    def __init__(self, model_type: str, model_config: dict, device: str):
+        super().__init__(model_type, model_config, device)
+        self.onnx_path = model_config.get("onnx_path") or os.path.splitext(self.model_path)[0] + ".onnx"
+
+    def _is_exported(self) -> bool:
+        if not os.path.exists(self.onnx_path):
+            return False
+        if not os.path.exists(self.model_path):
+            return True
+        return os.path.getmtime(self.onnx_path) >= os.path.getmtime(self.model_path)
+
+    def _export(self):
+        logger.info(f"Exporting {self.model_path} to ONNX......")
+        model = YOLO(self.model_path)
+        imgsz = model.args['imgsz'] if hasattr(model, 'args') else 640
+        exported_path = model.export(format="onnx", imgsz=imgsz, dynamic=False, device="cpu")
+        if os.path.abspath(exported_path) != os.path.abspath(self.onnx_path):
+            os.replace(exported_path, self.onnx_path)
+        logger.success(f"Exported ONNX model: {self.onnx_path}")
+
+    def _read_imgsz(self) -> int | tuple:
+        """从 ONNX 元数据中读取导出时的输入尺寸（只解析模型文件，不创建推理会话）"""
+        import onnx
+        metadata = {prop.key: prop.value for prop in onnx.load(self.onnx_path, load_external_data=False).metadata_props}
+        imgsz = metadata.get("imgsz")
+        return ast.literal_eval(imgsz) if imgsz else 640
+
+    def load(self) -> "OnnxBackend":
+        if not self._is_exported():
+            self._export()
+        self.model = YOLO(self.onnx_path, task="detect")
+        self.imgsz = self._read_imgsz()
+        logger.info(f"Model size: {self.imgsz}")
+        return self
+
+    def memory_footprint(self) -> int:
+        return os.path.getsize(self.onnx_path)
+
+    def get_scope_imgsz(self, crop: np.ndarray) -> int | tuple:
+        # 导出的 ONNX 模型为固定输入尺寸
+        return self.imgsz
+
+    def predict(self, frame: np.ndarray, **kwargs):
+        return self.model(frame, device=self.device, verbose=False, stream=True, **self._predict_kwargs(kwargs))
+
+
+BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def create_backend(model_type: str, model_config: dict, device: str) -> YoloBackend:
+    """
+    根据模型配置中的 backend 字段创建推理后端（默认 torch）
+    :param model_type: 模型类型
+    :param model_config: config.model_config 中的模型配置
+    :param device: 推理设备
+    :return: 已加载的推理后端
+    """
+    backend_name = model_config.get("backend", TorchBackend.name)
+    backend_cls = BACKENDS.get(backend_name)
+    if backend_cls is None:
+        raise ValueError(f"Unknown inference backend: {backend_name}")
+    logger.debug(f"Loading YOLO model {model_type} with {backend_name} backend...")
+    return backend_cls(model_type, model_config, device).load()
@@ -0,0 +1,263 @@
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Tuple
+
+import numpy as np
+
+from src.core.inference.frame_buffer import FrameSnapshot
+from src.core.inference.pipeline import DropOldestQueue
+from src.entity.Yolo import Yolo_Box, Yolo_Results
+from src.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class DetectionDiff:
+    """
+    相邻两帧检测结果的差异。
+
+    Attributes:
+        seq: 当前帧快照的序号。
+        timestamp: 当前帧的捕获时间（time.monotonic）。
+        appeared: 新出现的目标框（当前帧）。
+        disappeared: 消失的目标框（上一帧，图像区域可能已随帧释放）。
+        moved: 移动的目标框 (上一帧的框, 当前帧的框)。
+        labels_appeared: 上一帧不存在、当前帧存在的标签。
+        labels_disappeared: 上一帧存在、当前帧不存在的标签。
+    """
+    seq: int
+    timestamp: float
+    appeared: Tuple[Yolo_Box, ...] = ()
+    disappeared: Tuple[Yolo_Box, ...] = ()
+    moved: Tuple[Tuple[Yolo_Box, Yolo_Box], ...] = ()
+    labels_appeared: FrozenSet[str] = frozenset()
+    labels_disappeared: FrozenSet[str] = frozenset()
+
+    def __bool__(self):
+        return bool(self.appeared or self.disappeared or self.moved)
+
+    @property
+    def labels(self) -> FrozenSet[str]:
+        """发生变化的全部标签"""
+        return frozenset(
+            [box.label for box in self.appeared] + [box.label for box in self.disappeared]
+            + [current.label for _, current in self.moved]
+        )
+
+    def involves(self, labels: Iterable[str]) -> bool:
+        """是否有指定标签的目标框发生变化"""
+        return not self.labels.isdisjoint(labels)
+
+
+def _track_ids(results: Yolo_Results, rows: np.ndarray) -> np.ndarray:
+    """读取已创建的 Yolo_Box 上的 track_id（未跟踪为-1），不会为此创建 Yolo_Box"""
+    objs = results._objs[rows]
+    return np.array([-1 if obj is None or obj.track_id is None else obj.track_id for obj in objs], dtype=np.int64)
+
+
+def _match(previous: Yolo_Results, previous_rows: np.ndarray, current: Yolo_Results, current_rows: np.ndarray,
+           match_distance: float) -> Tuple[List[Tuple[int, int]], np.ndarray, np.ndarray]:
+    """
+    关联同一标签在前后两帧中的目标框：先按 track_id 关联，其余按中心点距离从近到远贪心关联
+    :return: (匹配的 (上一帧行, 当前帧行) 列表, 上一帧未匹配的行, 当前帧未匹配的行)
+    """
+    pairs = []
+    previous_free = np.ones(len(previous_rows), dtype=bool)
+    current_free = np.ones(len(current_rows), dtype=bool)
+    previous_ids = _track_ids(previous, previous_rows)
+    current_ids = _track_ids(current, current_rows)
+    if (previous_ids >= 0).any() and (current_ids >= 0).any():
+        position = {track_id: index for index, track_id in enumerate(previous_ids.tolist()) if track_id >= 0}
+        for index, track_id in enumerate(current_ids.tolist()):
+            if track_id >= 0 and (previous_index := position.get(track_id)) is not None:
+                pairs.append((previous_index, index))
+                previous_free[previous_index] = current_free[index] = False
+    if previous_free.any() and current_free.any():
+        previous_left, current_left = np.flatnonzero(previous_free), np.flatnonzero(current_free)
+        previous_xyxy = previous.xyxy[previous_rows[previous_left]]
+        current_xyxy = current.xyxy[current_rows[current_left]]
+        previous_centers = (previous_xyxy[:, :2] + previous_xyxy[:, 2:]) / 2
+        current_centers = (current_xyxy[:, :2] + current_xyxy[:, 2:]) / 2
+        distance = np.linalg.norm(previous_centers[:, None, :] - current_centers[None, :, :], axis=2)
+        for flat in np.argsort(distance, axis=None, kind='stable'):
+            i, j = divmod(int(flat), len(current_left))
+            if distance[i, j] > match_distance:
+                break
+            previous_index, current_index = previous_left[i], current_left[j]
+            if previous_free[previous_index] and current_free[current_index]:
+                pairs.append((previous_index, current_index))
+                previous_free[previous_index] = current_free[current_index] = False
+    matched = [(int(previous_rows[i]), int(current_rows[j])) for i, j in pairs]
+    return matched, previous_rows[previous_free], current_rows[current_free]
+
+
+def compute_diff(previous: Yolo_Results | None, current: Yolo_Results, seq: int = 0, timestamp: float = 0.0,
+                 move_threshold: float = 4, match_distance: float = 80) -> DetectionDiff:
+    """
+    计算相邻两帧检测结果的差异，只为发生变化的行创建 Yolo_Box
+    :param previous: 上一帧的检测结果，为None时当前帧的全部目标框视为新出现
+    :param current: 当前帧的检测结果
+    :param seq: 当前帧快照的序号
+    :param timestamp: 当前帧的捕获时间
+    :param move_threshold: 中心点移动超过该距离（像素）视为移动
+    :param match_distance: 中心点距离不超过该值（像素）的同标签目标框视为同一目标
+    :return: DetectionDiff
+    """
+    if previous is current:
+        return DetectionDiff(seq, timestamp)
+    if previous is None:
+        previous = Yolo_Results.from_boxes([])
+    # 画面静止时检测结果通常完全相同（结果按 (label, x, y) 排序，可以直接逐列比较）
+    if (len(previous) == len(current) and np.array_equal(previous.xyxy, current.xyxy)
+            and np.array_equal(previous.labels, current.labels)):
+        return DetectionDiff(seq, timestamp)
+    previous_index = previous._get_label_index()
+    current_index = current._get_label_index()
+    appeared, disappeared, moved = [], [], []
+    for label in previous_index.keys() | current_index.keys():
+        previous_rows = np.arange(*previous_index.get(label, (0, 0)))
+        current_rows = np.arange(*current_index.get(label, (0, 0)))
+        if not len(previous_rows) or not len(current_rows):
+            disappeared.extend(previous._box(row) for row in previous_rows)
+            appeared.extend(current._box(row) for row in current_rows)
+            continue
+        pairs, previous_left, current_left = _match(previous, previous_rows, current, current_rows, match_distance)
+        disappeared.extend(previous._box(row) for row in previous_left)
+        appeared.extend(current._box(row) for row in current_left)
+        for previous_row, current_row in pairs:
+            x1, y1, x2, y2 = previous.xyxy[previous_row]
+            u1, v1, u2, v2 = current.xyxy[current_row]
+            if np.hypot((u1 + u2 - x1 - x2) / 2, (v1 + v2 - y1 - y2) / 2) > move_threshold:
+                moved.append((previous._box(previous_row), current._box(current_row)))
+    return DetectionDiff(
+        seq, timestamp, tuple(appeared), tuple(disappeared), tuple(moved),
+        frozenset(current_index.keys() - previous_index.keys()),
+        frozenset(previous_index.keys() - current_index.keys()),
+    )
+
+
+class DetectionEventStream:
+    """
+    检测变化事件流：按顺序接收 DetectionDiff，消费者处理不及时时丢弃最旧的事件。
+
+    Attributes:
+        labels: 只接收涉及这些标签的事件，为None时接收全部事件。
+    """
+    labels: FrozenSet[str] | None
+    _queue: DropOldestQueue
+
+    def __init__(self, labels: Iterable[str] | None = None, maxsize: int = 64):
+        self.labels = None if labels is None else frozenset(labels)
+        self._queue = DropOldestQueue(maxsize)
+
+    @property
+    def dropped(self) -> int:
+        """被丢弃的事件数量"""
+        return self._queue.dropped
+
+    def _put(self, diff: DetectionDiff):
+        if self.labels is None or diff.involves(self.labels):
+            self._queue.put(diff)
+
+    def get(self, timeout: float | None = None) -> DetectionDiff | None:
+        """
+        取出下一个事件
+        :param timeout: 等待超时（秒），超时返回None
+        :return:
+        """
+        return self._queue.get(timeout)
+
+
+class DetectionEventBus:
+    """
+    检测变化事件总线：推理阶段将每个快照与上一个快照的检测结果做差分，
+    有变化时通知订阅者，消费者无需每帧轮询完整结果。
+    差分在推理阶段完成，不经过会丢弃快照的下游队列，不会漏掉短暂出现的变化。
+
+    Attributes:
+        move_threshold: 中心点移动超过该距离（像素）视为移动。
+        match_distance: 中心点距离不超过该值（像素）的同标签目标框视为同一目标。
+        queue_size: 事件流默认的队列容量。
+        published: 已发布的事件数量。
+    """
+    move_threshold: float
+    match_distance: float
+    queue_size: int
+    published: int = 0
+    _previous: Yolo_Results | None = None
+    _callbacks: Dict[int, Tuple[Callable[[DetectionDiff], None], FrozenSet[str] | None]]
+    _streams: List[DetectionEventStream]
+    _next_id: int = 0
+    _lock: threading.Lock
+
+    def __init__(self, move_threshold: float = 4, match_distance: float = 80, queue_size: int = 64):
+        self.move_threshold = move_threshold
+        self.match_distance = match_distance
+        self.queue_size = queue_size
+        self._callbacks = {}
+        self._streams = []
+        self._lock = threading.Lock()
+
+    def publish(self, snapshot: FrameSnapshot) -> DetectionDiff | None:
+        """
+        与上一个快照做差分并通知订阅者
+        :param snapshot: 帧快照
+        :return: 有变化时返回差异，否则返回None
+        """
+        diff = compute_diff(self._previous, snapshot.results, snapshot.seq, snapshot.timestamp,
+                            self.move_threshold, self.match_distance)
+        self._previous = snapshot.results
+        if not diff:
+            return None
+        self.published += 1
+        with self._lock:
+            callbacks = list(self._callbacks.values())
+            streams = list(self._streams)
+        for callback, labels in callbacks:
+            if labels is not None and not diff.involves(labels):
+                continue
+            try:
+                callback(diff)
+            except Exception:
+                logger.exception("Detection event callback failed")
+        for stream in streams:
+            stream._put(diff)
+        return diff
+
+    def reset(self):
+        """清除上一帧的检测结果，下一个快照的全部目标框视为新出现"""
+        self._previous = None
+
+    def subscribe(self, callback: Callable[[DetectionDiff], None],
+                  labels: Iterable[str] | None = None) -> Callable[[], None]:
+        """
+        订阅检测变化事件（回调在推理阶段的线程中执行，应尽快返回，耗时的处理请使用 stream）
+        :param callback: 回调函数，参数为 DetectionDiff
+        :param labels: 只接收涉及这些标签的事件，为None时接收全部事件
+        :return: 取消订阅的函数
+        """
+        with self._lock:
+            self._next_id += 1
+            key = self._next_id
+            self._callbacks[key] = (callback, None if labels is None else frozenset(labels))
+
+        def unsubscribe():
+            with self._lock:
+                self._callbacks.pop(key, None)
+        return unsubscribe
+
+    @contextmanager
+    def stream(self, labels: Iterable[str] | None = None, maxsize: int | None = None):
+        """
+        在上下文内打开一个事件流（供任务线程阻塞等待变化）
+        :param labels: 只接收涉及这些标签的事件，为None时接收全部事件
+        :param maxsize: 队列容量，为None时使用 queue_size
+        """
+        stream = DetectionEventStream(labels, maxsize or self.queue_size)
+        with self._lock:
+            self._streams.append(stream)
+        try:
+            yield stream
+        finally:
+            with self._lock:
+                self._streams.remove(stream)
@@ -0,0 +1,160 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from time import monotonic
+from typing import Callable, Deque, List, Any
+
+import numpy as np
+
+from src.entity.Yolo import Yolo_Results
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    """
+    帧快照：一帧图像及其推理结果。
+
+    Attributes:
+        seq: 序号（从1开始递增）。
+        timestamp: 捕获时间（time.monotonic）。
+        frame: 图像帧。
+        results: 推理结果。
+    """
+    seq: int
+    timestamp: float
+    frame: np.ndarray
+    results: Yolo_Results
+
+
+class FrameRingBuffer:
+    """
+    帧环形缓冲区：保存最近 capacity 帧的快照，并提供按序号等待/查询的方法，
+    等待检测结果的逻辑可以在新结果到达时立即返回，而不是固定休眠。
+
+    Attributes:
+        capacity: 缓冲区容量（帧数）。
+    """
+    capacity: int
+    _buffer: Deque[FrameSnapshot]
+    _condition: threading.Condition
+    _seq: int = 0
+
+    def __init__(self, capacity: int = 30):
+        self.capacity = max(1, capacity)
+        self._buffer = deque(maxlen=self.capacity)
+        self._condition = threading.Condition()
+
+    def append(self, frame: np.ndarray, results: Yolo_Results, timestamp: float | None = None) -> FrameSnapshot:
+        """
+        追加一帧快照并唤醒等待者
+        :param frame: 图像帧
+        :param results: 推理结果
+        :param timestamp: 捕获时间，为None时使用当前时间
+        :return: 新的快照
+        """
+        with self._condition:
+            self._seq += 1
+            snapshot = FrameSnapshot(self._seq, monotonic() if timestamp is None else timestamp, frame, results)
+            self._buffer.append(snapshot)
+            self._condition.notify_all()
+        return snapshot
+
+    def clear(self):
+        """清空缓冲区（序号继续递增）"""
+        with self._condition:
+            self._buffer.clear()
+
+    @property
+    def latest(self) -> FrameSnapshot | None:
+        """最新快照"""
+        with self._condition:
+            return self._buffer[-1] if self._buffer else None
+
+    @property
+    def latest_seq(self) -> int:
+        """最新快照的序号，没有快照时为0"""
+        return self._seq
+
+    def snapshots(self) -> List[FrameSnapshot]:
+        """缓冲区中的全部快照（从旧到新）"""
+        with self._condition:
+            return list(self._buffer)
+
+    def _first_newer(self, seq: int) -> FrameSnapshot | None:
+        if not self._buffer or self._seq <= seq:
+            return None
+        # 序号连续，可直接计算下标；早于缓冲区的部分从最旧的快照开始
+        return self._buffer[max(0, len(self._buffer) - (self._seq - seq))]
+
+    def first_newer(self, seq: int) -> FrameSnapshot | None:
+        """
+        查询序号大于 seq 的第一个快照
+        :param seq: 序号
+        :return: 快照，不存在时返回None
+        """
+        with self._condition:
+            return self._first_newer(seq)
+
+    def wait_newer(self, seq: int, timeout: float | None = None, newest: bool = False) -> FrameSnapshot | None:
+        """
+        等待序号大于 seq 的快照
+        :param seq: 序号
+        :param timeout: 超时时间（秒），为None时一直等待
+        :param newest: 为True时返回最新快照，否则返回序号大于 seq 的第一个快照
+        :return: 快照，超时返回None
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._seq > seq and self._buffer, timeout):
+                return None
+            return self._buffer[-1] if newest else self._first_newer(seq)
+
+    def wait_for(self, predicate: Callable[[Yolo_Results], Any], timeout: float | None = None,
+                 after_seq: int | None = None, consecutive: int = 1, newest: bool = False,
+                 key: Callable[[FrameSnapshot], Yolo_Results] | None = None,
+                 min_span: float = 0) -> FrameSnapshot | None:
+        """
+        等待推理结果满足条件
+        :param predicate: 判断条件，参数为推理结果（指定 key 时为 key 的返回值）
+        :param timeout: 超时时间（秒），为None时一直等待
+        :param after_seq: 只检查序号大于该值的快照，为None时从当前最新快照之后开始
+        :param consecutive: 需要连续满足条件的帧数
+        :param newest: 为True时每次只检查最新快照（适合开销较大的判断，跳过的帧不影响连续计数）
+        :param key: 从快照取得判断对象（如按检测范围重新推理），为None时使用快照的推理结果
+        :param min_span: 连续满足条件的第一帧与最后一帧的最小捕获时间间隔（秒），帧率较高时避免短暂出现的目标被误判
+        :return: 最后一个满足条件的快照，超时返回None
+        """
+        seq = self.latest_seq if after_seq is None else after_seq
+        deadline = None if timeout is None else monotonic() + timeout
+        count = 0
+        first_timestamp = 0.0
+        while True:
+            remaining = None if deadline is None else deadline - monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            snapshot = self.wait_newer(seq, remaining, newest)
+            if snapshot is None:
+                return None
+            # 中间有快照已被覆盖时，连续计数重新开始
+            if not newest and snapshot.seq != seq + 1:
+                count = 0
+            seq = snapshot.seq
+            if predicate(snapshot.results if key is None else key(snapshot)):
+                if count == 0:
+                    first_timestamp = snapshot.timestamp
+                count += 1
+                if count >= consecutive and snapshot.timestamp - first_timestamp >= min_span:
+                    return snapshot
+            else:
+                count = 0
+
+    def label_in_consecutive(self, label: str, k: int, after_seq: int = 0) -> bool:
+        """
+        判断最近 k 帧（序号大于 after_seq）是否都检测到指定标签
+        :param label: 标签
+        :param k: 帧数
+        :param after_seq: 只检查序号大于该值的快照
+        :return:
+        """
+        with self._condition:
+            recent = [snapshot for snapshot in list(self._buffer)[-k:] if snapshot.seq > after_seq]
+        return len(recent) == k and all(snapshot.results.exists_label(label) for snapshot in recent)
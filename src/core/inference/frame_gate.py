@@ -0,0 +1,84 @@
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+
+class FrameChangeDetector:
+    """
+    帧变化检测器：将帧下采样为灰度小图，与上一次推理时的参考帧做差分，
+    按网格分块计算各块的平均像素差，任一分块超过阈值即判定画面变化。
+    按钮状态、数字等局部的小变化在整帧平均中会被稀释，按分块取最大值可以检测到。
+
+    Attributes:
+        threshold: 变化阈值（变化最大的分块的平均像素差，0-255）。
+        sample_size: 下采样尺寸（宽, 高）。
+        grid: 分块数量（列, 行）。
+        max_skip: 最大连续跳过帧数，超过后强制推理（0 表示不限制）。
+        total_frames: 已检测的帧总数。
+        skipped_frames: 被判定为静态而跳过推理的帧数。
+        last_diff: 最近一次检测的差异值（变化最大的分块的平均像素差）。
+        last_mean_diff: 最近一次检测的整帧平均像素差（用于判断画面突变）。
+    """
+    threshold: float
+    sample_size: Tuple[int, int]
+    grid: Tuple[int, int]
+    max_skip: int
+    total_frames: int = 0
+    skipped_frames: int = 0
+    last_diff: float = float("inf")
+    last_mean_diff: float = float("inf")
+    _reference: np.ndarray | None = None
+    _continuous_skipped: int = 0
+
+    def __init__(self, threshold: float = 4.0, sample_size: Tuple[int, int] = (160, 90), max_skip: int = 30,
+                 grid: Tuple[int, int] = (16, 9)):
+        self.threshold = threshold
+        self.sample_size = tuple(sample_size)
+        self.grid = (min(grid[0], self.sample_size[0]), min(grid[1], self.sample_size[1]))
+        self.max_skip = max_skip
+
+    def _sample(self, frame: np.ndarray) -> np.ndarray:
+        small = cv2.resize(frame, self.sample_size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def _tile_diff(self, diff: np.ndarray) -> np.ndarray:
+        """各分块的平均像素差（区域插值缩放到网格尺寸即为分块均值）"""
+        return cv2.resize(diff, self.grid, interpolation=cv2.INTER_AREA)
+
+    def is_changed(self, frame: np.ndarray) -> bool:
+        """
+        判断当前帧是否需要重新推理，需要推理时会将当前帧更新为参考帧
+        :param frame: 图像帧
+        :return: True 表示画面已变化
+        """
+        self.total_frames += 1
+        sample = self._sample(frame)
+        if self._reference is None:
+            self.last_diff = self.last_mean_diff = float("inf")
+        else:
+            diff = cv2.absdiff(sample, self._reference)
+            self.last_diff = float(self._tile_diff(diff).max())
+            self.last_mean_diff = float(diff.mean())
+        if (self.last_diff > self.threshold
+                or (self.max_skip and self._continuous_skipped >= self.max_skip)):
+            self._reference = sample
+            self._continuous_skipped = 0
+            return True
+        self._continuous_skipped += 1
+        self.skipped_frames += 1
+        return False
+
+    def reset(self):
+        """清除参考帧，下一帧必定推理（切换模型等场景使用）"""
+        self._reference = None
+        self._continuous_skipped = 0
+
+    @property
+    def skip_ratio(self) -> float:
+        """跳过推理的帧占比"""
+        if not self.total_frames:
+            return 0.0
+        return self.skipped_frames / self.total_frames
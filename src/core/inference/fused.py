@@ -0,0 +1,58 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+
+from src.core.inference.latency import LatencyMeter
+from src.core.inference.model_registry import ModelRegistry
+from src.core.inference.scope import DetectionScope
+from src.entity.Yolo import Yolo_Results
+
+
+class FusedInference:
+    """
+    融合推理：在同一帧上同时运行多个模型，并将结果合并为一个 Yolo_Results。
+
+    帧只捕获一次，各模型在独立线程中并行推理（推理过程会释放GIL），
+    合并后的目标框通过 Yolo_Box.model_type 区分标签命名空间。
+
+    Attributes:
+        model_types: 参与融合推理的模型类型。
+        latency: 合并后的单帧总延迟统计。
+    """
+    model_types: List[str]
+    latency: LatencyMeter
+    _registry: ModelRegistry
+    _executor: ThreadPoolExecutor
+    # 流水线与任务线程可能同时调用 infer，串行化以保证延迟统计正确
+    _lock: threading.Lock
+
+    def __init__(self, registry: ModelRegistry, model_types: List[str]):
+        self._registry = registry
+        self.model_types = model_types
+        # 每帧都要使用全部模型，固定常驻，避免内存预算淘汰后每帧重新加载
+        registry.pin(model_types)
+        self.latency = LatencyMeter()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=len(model_types), thread_name_prefix="fused-infer")
+
+    def infer(self, frame: np.ndarray, scope: DetectionScope | None = None) -> Yolo_Results:
+        """
+        在同一帧上运行所有模型并合并结果
+        :param frame: 图像帧
+        :param scope: 检测范围
+        :return: 合并后的 Yolo_Results
+        """
+        with self._lock, self.latency:
+            backends = [self._registry.load(model_type) for model_type in self.model_types]
+            futures = [self._executor.submit(backend.infer, frame, scope) for backend in backends]
+            return Yolo_Results.merge([future.result() for future in futures])
+
+    def get_latency_report(self) -> dict:
+        """合并延迟与各模型单独延迟"""
+        report = {"fused": self.latency.to_dict()}
+        for model_type in self.model_types:
+            if backend := self._registry.get(model_type):
+                report[model_type] = backend.latency.to_dict()
+        return report
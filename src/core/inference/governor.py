@@ -0,0 +1,93 @@
+import threading
+from contextlib import contextmanager
+from time import monotonic
+from typing import Callable, Dict
+
+from src.utils.logger import logger
+
+
+class GovernorState:
+    # 没有任务在执行
+    IDLE = "IDLE"
+    # 任务执行中
+    RUNNING = "RUNNING"
+    # 任务正在等待标签/按钮/模态框等检测结果
+    WAITING = "WAITING"
+
+
+class RateGovernor:
+    """
+    捕获/推理帧率调节器：根据任务队列状态与调试客户端连接情况决定目标帧率，
+    捕获阶段每帧调用 throttle() 等待到下一帧的时间点。
+
+    任务进入等待（boost）时会立即唤醒正在休眠的捕获阶段并恢复全速。
+
+    Attributes:
+        state_fps: 各状态下的目标帧率，None 表示不限速。
+        viewer_fps: 有调试客户端连接时的最低帧率。
+    """
+    state_fps: Dict[str, float | None]
+    viewer_fps: float | None
+    _is_task_running: Callable[[], bool]
+    _has_viewers: Callable[[], bool]
+    _waiters: int = 0
+    _lock: threading.Lock
+    _wake_event: threading.Event
+    _last_tick: float = 0
+
+    def __init__(self, state_fps: Dict[str, float | None], viewer_fps: float | None,
+                 is_task_running: Callable[[], bool], has_viewers: Callable[[], bool]):
+        self.state_fps = state_fps
+        self.viewer_fps = viewer_fps
+        self._is_task_running = is_task_running
+        self._has_viewers = has_viewers
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+
+    @property
+    def state(self) -> str:
+        if self._waiters > 0:
+            return GovernorState.WAITING
+        if self._is_task_running():
+            return GovernorState.RUNNING
+        return GovernorState.IDLE
+
+    @property
+    def target_fps(self) -> float | None:
+        """当前目标帧率，None 表示不限速"""
+        fps = self.state_fps.get(self.state)
+        if fps is not None and self.viewer_fps and self._has_viewers():
+            fps = max(fps, self.viewer_fps)
+        return fps
+
+    @contextmanager
+    def boost(self):
+        """在上下文内以全速捕获推理（等待检测结果时使用）"""
+        with self._lock:
+            self._waiters += 1
+        self.wake()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._waiters -= 1
+
+    def wake(self):
+        """唤醒正在休眠的捕获阶段"""
+        self._wake_event.set()
+
+    def throttle(self):
+        """休眠到下一帧的时间点，期间被唤醒或帧率提高时立即返回"""
+        while True:
+            fps = self.target_fps
+            if not fps:
+                break
+            remaining = self._last_tick + 1 / fps - monotonic()
+            if remaining <= 0:
+                break
+            # 分段休眠，以便及时响应调试客户端连接等状态变化
+            if self._wake_event.wait(min(remaining, 0.5)):
+                self._wake_event.clear()
+                logger.debug(f"Rate governor woken up ({self.state})")
+                break
+        self._last_tick = monotonic()
@@ -0,0 +1,38 @@
+from time import perf_counter
+
+
+class LatencyMeter:
+    """
+    延迟统计：记录最近一次耗时及指数滑动平均耗时（毫秒）
+    """
+    last_ms: float | None = None
+    average_ms: float | None = None
+    count: int = 0
+    _smoothing: float
+    _start: float | None = None
+
+    def __init__(self, smoothing: float = 0.1):
+        self._smoothing = smoothing
+
+    def record(self, elapsed_ms: float):
+        self.last_ms = elapsed_ms
+        self.count += 1
+        if self.average_ms is None:
+            self.average_ms = elapsed_ms
+        else:
+            self.average_ms += (elapsed_ms - self.average_ms) * self._smoothing
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.record((perf_counter() - self._start) * 1000)
+
+    def to_dict(self) -> dict:
+        return {
+            "last_ms": round(self.last_ms, 2) if self.last_ms is not None else None,
+            "average_ms": round(self.average_ms, 2) if self.average_ms is not None else None,
+            "count": self.count,
+        }
@@ -0,0 +1,178 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Set, Tuple
+
+from src.core.inference.backends import YoloBackend, create_backend
+from src.utils.logger import logger
+
+
+class ModelRegistry:
+    """
+    常驻模型注册表：预先加载并预热模型，切换模型时只原子替换当前模型引用，
+    加载过程在调用方线程或后台线程完成，不会暂停帧处理流水线。
+
+    开启内存预算（memory_budget_mb）后，超出预算时淘汰最久未使用的非当前、非固定模型。
+    """
+    model_configs: Dict[str, dict]
+    device: str
+    memory_budget_mb: float | None
+    _models: "OrderedDict[str, YoloBackend]"
+    _active: YoloBackend | None = None
+    _lock: threading.Lock
+    _loading: Dict[str, threading.Event]
+    # 固定常驻的模型（如融合推理每帧都要使用的模型），不会被淘汰
+    _pinned: Set[str]
+    # 是否已提示过固定模型超出内存预算
+    _over_budget_warned: bool = False
+    # 预热使用的帧尺寸 (高, 宽)，为None时使用模型输入尺寸
+    warmup_shape: Tuple[int, int] | None = None
+
+    def __init__(self, model_configs: Dict[str, dict], device: str, memory_budget_mb: float | None = None):
+        self.model_configs = model_configs
+        self.device = device
+        self.memory_budget_mb = memory_budget_mb
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+        self._pinned = set()
+
+    @property
+    def active(self) -> YoloBackend | None:
+        """当前模型"""
+        return self._active
+
+    @property
+    def active_type(self) -> str | None:
+        return self._active.model_type if self._active else None
+
+    def get(self, model_type: str) -> YoloBackend | None:
+        """获取常驻模型（不触发加载）"""
+        return self._models.get(model_type)
+
+    def is_loaded(self, model_type: str) -> bool:
+        return model_type in self._models
+
+    def get_loaded_types(self) -> List[str]:
+        return list(self._models.keys())
+
+    def _check_model_type(self, model_type: str):
+        if model_type not in self.model_configs:
+            raise ValueError(f'Unknown model type: {model_type}')
+
+    def _get_warmup_shape(self, backend: YoloBackend) -> Tuple[int, int]:
+        if self.warmup_shape:
+            return self.warmup_shape
+        imgsz = backend.imgsz if isinstance(backend.imgsz, (list, tuple)) else (backend.imgsz, backend.imgsz)
+        return imgsz[0], imgsz[1]
+
+    def warmup(self, shape: Tuple[int, int], iterations: int = 3, model_types: List[str] | None = None) -> dict:
+        """
+        预热阶段：加载并使用实际捕获分辨率的合成帧预热模型，阻塞调用方线程
+        :param shape: 捕获帧尺寸 (高, 宽)
+        :param iterations: 每个模型的预热次数
+        :param model_types: 需要预热的模型（默认全部）
+        :return: 各模型的预热耗时
+        """
+        self.warmup_shape = shape
+        for model_type in model_types or list(self.model_configs.keys()):
+            backend = self.load(model_type)
+            timings = backend.warmup(shape, iterations)
+            logger.info(f"Model {model_type} warmed up: {timings}")
+        return self.get_warmup_timings()
+
+    def get_warmup_timings(self) -> dict:
+        """获取常驻模型的预热耗时"""
+        return {model_type: backend.warmup_timings for model_type, backend in list(self._models.items())}
+
+    def load(self, model_type: str) -> YoloBackend:
+        """
+        加载并预热模型（已加载时直接返回），阻塞调用方线程
+        :param model_type: 模型类型
+        :return: 推理后端
+        """
+        self._check_model_type(model_type)
+        while True:
+            with self._lock:
+                if model_type in self._models:
+                    return self._models[model_type]
+                event = self._loading.get(model_type)
+                if event is None:
+                    event = self._loading[model_type] = threading.Event()
+                    break
+            # 其他线程正在加载同一模型，等待其完成
+            event.wait()
+        try:
+            backend = create_backend(model_type, self.model_configs[model_type], self.device)
+            backend.warmup(self._get_warmup_shape(backend))
+            with self._lock:
+                self._models[model_type] = backend
+                self._evict()
+            logger.success(f"Model {model_type} loaded")
+            return backend
+        finally:
+            with self._lock:
+                self._loading.pop(model_type).set()
+
+    def pin(self, model_types: List[str]):
+        """
+        固定模型常驻，不参与内存预算淘汰（融合推理等每帧都需要多个模型的场景）
+        :param model_types: 模型类型
+        """
+        for model_type in model_types:
+            self._check_model_type(model_type)
+        with self._lock:
+            self._pinned.update(model_types)
+            self._over_budget_warned = False
+
+    def unpin(self, model_types: List[str]):
+        """取消固定模型常驻"""
+        with self._lock:
+            self._pinned.difference_update(model_types)
+            self._evict()
+
+    def load_async(self, model_type: str) -> threading.Thread:
+        """在后台线程中加载模型"""
+        self._check_model_type(model_type)
+        thread = threading.Thread(target=logger.catch(self.load), args=(model_type,), daemon=True)
+        thread.start()
+        return thread
+
+    def preload(self, model_types: List[str] | None = None):
+        """在后台预加载模型（默认全部）"""
+        for model_type in model_types or list(self.model_configs.keys()):
+            if not self.is_loaded(model_type):
+                self.load_async(model_type)
+
+    def switch(self, model_type: str) -> YoloBackend:
+        """
+        切换当前模型：模型未常驻时先在调用方线程加载，加载期间流水线继续使用旧模型
+        :param model_type: 模型类型
+        :return: 切换后的推理后端
+        """
+        backend = self.load(model_type)
+        with self._lock:
+            # 模型可能在加载后被其他线程淘汰，重新放回注册表
+            self._models[model_type] = backend
+            self._models.move_to_end(model_type)
+            self._active = backend
+            self._evict()
+        logger.debug(f"Switched YOLO model to {model_type}")
+        return backend
+
+    def _evict(self):
+        """超出内存预算时淘汰最久未使用的非当前、非固定模型（需持有锁）"""
+        if self.memory_budget_mb is None:
+            return
+        budget = self.memory_budget_mb * 1024 * 1024
+        for model_type in list(self._models.keys()):
+            if sum(backend.memory_footprint() for backend in self._models.values()) <= budget:
+                return
+            if self._models[model_type] is self._active or model_type in self._pinned:
+                continue
+            self._models.pop(model_type)
+            logger.info(f"Evicted model {model_type} (memory budget: {self.memory_budget_mb}MB)")
+        if sum(backend.memory_footprint() for backend in self._models.values()) > budget and not self._over_budget_warned:
+            # 剩余的都是当前模型或固定模型，无法继续淘汰
+            self._over_budget_warned = True
+            logger.warning(f"Pinned models {sorted(self._pinned)} exceed the memory budget "
+                           f"({self.memory_budget_mb}MB), they are kept resident anyway")
@@ -0,0 +1,166 @@
+import threading
+from collections import deque
+from typing import Callable, List, Any
+
+from src.utils.logger import logger
+
+
+class DropOldestQueue:
+    """
+    有界队列：队列已满时丢弃最旧的元素，保证消费者总是拿到最新的数据。
+
+    Attributes:
+        maxsize: 队列容量。
+        dropped: 累计被丢弃的元素数量。
+    """
+    maxsize: int
+    dropped: int = 0
+    _items: deque
+    _condition: threading.Condition
+
+    def __init__(self, maxsize: int = 1):
+        if maxsize < 1:
+            raise ValueError(f"Invalid queue size: {maxsize}")
+        self.maxsize = maxsize
+        self._items = deque(maxlen=maxsize)
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, item: Any):
+        """放入元素，队列已满时丢弃最旧的元素"""
+        with self._condition:
+            if len(self._items) >= self.maxsize:
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout: float | None = None) -> Any | None:
+        """
+        取出最旧的元素
+        :param timeout: 等待超时（秒），超时返回None
+        :return:
+        """
+        with self._condition:
+            if not self._items:
+                self._condition.wait(timeout)
+            return self._items.popleft() if self._items else None
+
+    def clear(self):
+        with self._condition:
+            self._items.clear()
+
+
+class PipelineStage:
+    """
+    流水线阶段：在独立线程中循环执行处理函数。
+
+    有输入队列时，处理函数接收队列中取出的元素；没有输入队列时（如捕获阶段）直接调用。
+    处理函数返回非None值时，结果会放入所有输出队列。
+    停止后线程在当前处理结束前被重新启动时，复用该线程继续运行。
+    """
+    name: str
+    handler: Callable
+    input_queue: DropOldestQueue | None
+    output_queues: List[DropOldestQueue]
+    # 运行中的线程，线程确定退出时置为None
+    _thread: threading.Thread | None = None
+    _running: bool = False
+    # 保护 _running 与 _thread：线程退出与重新启动之间不会出现既不复用也不新建的情况
+    _lock: threading.Lock
+
+    def __init__(self, name: str, handler: Callable, input_queue: DropOldestQueue | None = None,
+                 output_queues: List[DropOldestQueue] | None = None):
+        self.name = name
+        self.handler = handler
+        self.input_queue = input_queue
+        self.output_queues = output_queues or []
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            stopping = not self._running
+            self._running = True
+            if self.is_alive():
+                if stopping:
+                    logger.info(f"Pipeline stage [{self.name}] has not exited yet, reusing its thread")
+                return
+            self._thread = threading.Thread(target=self._run, name=f"pipeline-{self.name}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+
+    def join(self, timeout: float | None = None):
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def _run(self):
+        while True:
+            self._loop()
+            with self._lock:
+                # 停止后、退出前又被重新启动时继续运行
+                if self._running:
+                    continue
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                return
+
+    def _loop(self):
+        while self._running:
+            try:
+                if self.input_queue is not None:
+                    item = self.input_queue.get(timeout=0.5)
+                    if item is None:
+                        continue
+                    result = self.handler(item)
+                else:
+                    result = self.handler()
+            except Exception:
+                logger.exception(f"Pipeline stage [{self.name}] failed")
+                continue
+            if result is None:
+                continue
+            for queue in self.output_queues:
+                queue.put(result)
+
+
+class FramePipeline:
+    """
+    帧处理流水线：由多个阶段组成，阶段之间通过丢弃最旧帧的有界队列连接，
+    任意一个慢阶段都不会阻塞上游阶段。
+    """
+    stages: List[PipelineStage]
+
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = stages
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self, timeout: float | None = None):
+        """停止所有阶段并等待线程退出"""
+        for stage in self.stages:
+            stage.stop()
+        for stage in self.stages:
+            stage.join(timeout)
+        for stage in self.stages:
+            if stage.input_queue is not None:
+                stage.input_queue.clear()
+
+    def is_alive(self) -> bool:
+        return any(stage.is_alive() for stage in self.stages)
+
+    def get_queue_stats(self) -> dict:
+        """获取各阶段输入队列的积压与丢帧统计"""
+        return {
+            stage.name: {"pending": len(stage.input_queue), "dropped": stage.input_queue.dropped}
+            for stage in self.stages if stage.input_queue is not None
+        }
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from typing import Tuple, List, Dict
+
+
+@dataclass(frozen=True)
+class DetectionScope:
+    """
+    检测范围：推理时只处理裁剪区域，并只保留指定类别。
+
+    检测范围按调用生效（AppProcessor.detect），不会影响流水线的整帧推理及其他线程。
+    没有裁剪区域的范围只按标签筛选快照中已有的推理结果，不会重复推理。
+
+    Attributes:
+        region: 裁剪区域 (x1, y1, x2, y2)，为None表示整帧。
+        labels: 需要检测的标签列表，为None表示全部标签。
+        relative: region 是否为相对帧宽高的比例（0-1）。
+        name: 请求方名称，写入推理结果（Yolo_Results.scope）用于区分来源。
+    """
+    region: Tuple[float, float, float, float] | None = None
+    labels: Tuple[str, ...] | None = None
+    relative: bool = False
+    name: str | None = None
+
+    def __post_init__(self):
+        if self.labels is not None and not isinstance(self.labels, tuple):
+            object.__setattr__(self, "labels", tuple(self.labels))
+
+    def resolve_region(self, width: int, height: int) -> Tuple[int, int, int, int] | None:
+        """
+        计算在指定帧尺寸下的像素裁剪区域
+        :param width: 帧宽度
+        :param height: 帧高度
+        :return: (x1, y1, x2, y2)，区域无效时返回None
+        """
+        if self.region is None:
+            return None
+        x1, y1, x2, y2 = self.region
+        if self.relative:
+            x1, x2 = x1 * width, x2 * width
+            y1, y2 = y1 * height, y2 * height
+        x1, y1 = max(0, int(x1)), max(0, int(y1))
+        x2, y2 = min(width, int(x2)), min(height, int(y2))
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return x1, y1, x2, y2
+
+    def resolve_classes(self, names: Dict[int, str]) -> List[int] | None:
+        """
+        将标签列表转换为模型的类别ID
+        :param names: 模型的类别ID → 标签名
+        :return: 类别ID列表，为None表示不过滤
+        """
+        if self.labels is None:
+            return None
+        return [class_id for class_id, name in names.items() if name in self.labels]
@@ -0,0 +1,161 @@
+import threading
+from typing import List
+
+import cv2
+import numpy as np
+
+from src.entity.Yolo import Yolo_Box, Yolo_Results
+
+
+def _iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """计算两组 (x1, y1, x2, y2) 框的 IoU 矩阵"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-6), 0)
+
+
+class BoxTracker:
+    """
+    目标框跟踪器：每隔 detect_interval 帧（或画面突变时）运行一次完整检测，
+    中间帧使用稀疏光流（Lucas-Kanade）平移上一帧的目标框。
+
+    检测帧通过同标签 IoU 关联上一帧的目标框，为每个框分配稳定的 track_id。
+
+    Attributes:
+        detect_interval: 完整检测间隔帧数。
+        iou_threshold: 关联同一目标的最小 IoU。
+        detected_frames: 完整检测的帧数。
+        tracked_frames: 使用光流跟踪的帧数。
+    """
+    detect_interval: int
+    iou_threshold: float
+    detected_frames: int = 0
+    tracked_frames: int = 0
+    _results: Yolo_Results | None = None
+    _prev_gray: np.ndarray | None = None
+    _frames_since_detection: int = 0
+    _next_track_id: int = 1
+    _lock: threading.Lock
+
+    def __init__(self, detect_interval: int = 3, iou_threshold: float = 0.3):
+        self.detect_interval = max(1, detect_interval)
+        self.iou_threshold = iou_threshold
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """清除跟踪状态，下一帧必定完整检测"""
+        with self._lock:
+            self._results = None
+            self._prev_gray = None
+
+    def need_detection(self, scene_changed: bool = False) -> bool:
+        """
+        判断当前帧是否需要完整检测
+        :param scene_changed: 画面是否发生突变
+        :return:
+        """
+        return (scene_changed or self._results is None
+                or self._frames_since_detection + 1 >= self.detect_interval)
+
+    def update_detection(self, results: Yolo_Results, frame: np.ndarray) -> Yolo_Results:
+        """
+        记录完整检测结果，并为目标框分配 track_id
+        :param results: 完整检测的结果
+        :param frame: 图像帧
+        :return: 分配 track_id 后的结果
+        """
+        with self._lock:
+            self._assign_track_ids(results.boxes, self._results.boxes if self._results else [])
+            self._results = results
+            self._prev_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            self._frames_since_detection = 0
+            self.detected_frames += 1
+        return results
+
+    def _assign_track_ids(self, boxes: List[Yolo_Box], prev_boxes: List[Yolo_Box]):
+        for label in {box.label for box in boxes}:
+            current = [box for box in boxes if box.label == label]
+            previous = [box for box in prev_boxes if box.label == label]
+            matched = set()
+            if previous:
+                iou = _iou_matrix(
+                    np.array([(b.x, b.y, b.w, b.h) for b in current], dtype=np.float32),
+                    np.array([(b.x, b.y, b.w, b.h) for b in previous], dtype=np.float32)
+                )
+                # 按 IoU 从大到小贪心匹配
+                for i, j in zip(*np.unravel_index(np.argsort(-iou, axis=None), iou.shape)):
+                    if iou[i, j] < self.iou_threshold:
+                        break
+                    if current[i].track_id is not None or j in matched:
+                        continue
+                    current[i].track_id = previous[j].track_id
+                    matched.add(j)
+            for box in current:
+                if box.track_id is None:
+                    box.track_id = self._next_track_id
+                    self._next_track_id += 1
+
+    def track(self, frame: np.ndarray) -> Yolo_Results:
+        """
+        使用光流将上一帧的目标框平移到当前帧
+        :param frame: 图像帧
+        :return: 跟踪得到的结果
+        """
+        with self._lock:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            prev_boxes = self._results.boxes
+            height, width = gray.shape[:2]
+            offsets = self._estimate_offsets(self._prev_gray, gray, prev_boxes)
+            boxes = []
+            for box, (dx, dy) in zip(prev_boxes, offsets):
+                dx = int(np.clip(dx, -box.x, width - box.w))
+                dy = int(np.clip(dy, -box.y, height - box.h))
+                x1, y1, x2, y2 = box.x + dx, box.y + dy, box.w + dx, box.h + dy
+                tracked = Yolo_Box(x1, y1, x2, y2, box.label, None, box.model_type, source=frame)
+                tracked.track_id = box.track_id
+                boxes.append(tracked)
+            results = Yolo_Results.from_boxes(boxes)
+            # 调试画面沿用最近一次检测的原始结果
+            results.results = self._results.results
+            results.region = self._results.region
+            self._results = results
+            self._prev_gray = gray
+            self._frames_since_detection += 1
+            self.tracked_frames += 1
+            return results
+
+    @staticmethod
+    def _estimate_offsets(prev_gray: np.ndarray, gray: np.ndarray, boxes: List[Yolo_Box]) -> List[tuple]:
+        """估算每个目标框的平移量（框内特征点光流位移的中位数，没有特征点时视为静止）"""
+        offsets = [(0, 0)] * len(boxes)
+        if not boxes or prev_gray is None or prev_gray.shape != gray.shape:
+            return offsets
+        mask = np.zeros_like(prev_gray)
+        for box in boxes:
+            mask[box.y:box.h, box.x:box.w] = 255
+        points = cv2.goodFeaturesToTrack(prev_gray, maxCorners=500, qualityLevel=0.01, minDistance=5, mask=mask)
+        if points is None:
+            return offsets
+        next_points, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, points, None)
+        valid = status.reshape(-1) == 1
+        points = points.reshape(-1, 2)[valid]
+        motion = next_points.reshape(-1, 2)[valid] - points
+        for index, box in enumerate(boxes):
+            inside = ((points[:, 0] >= box.x) & (points[:, 0] < box.w) &
+                      (points[:, 1] >= box.y) & (points[:, 1] < box.h))
+            if inside.any():
+                dx, dy = np.median(motion[inside], axis=0)
+                offsets[index] = (round(float(dx)), round(float(dy)))
+        return offsets
+
+    @property
+    def detection_ratio(self) -> float:
+        """完整检测帧占比"""
+        total = self.detected_frames + self.tracked_frames
+        return self.detected_frames / total if total else 1.0
@@ -14,22 +14,23 @@ from tests.ORB_test import handle_new_image
 
 if TYPE_CHECKING:
     from app import AppProcessor
+    from src.core.inference.frame_buffer import FrameSnapshot
 
 last_card_name = ""
 
 def register_middlewares(processor: "AppProcessor"):
     @processor.register_middleware()
     @logger.catch
-    def _init_location(app: "AppProcessor"):
+    def _init_location(app: "AppProcessor", snapshot: "FrameSnapshot"):
         if app.game_status_manager.current_location is None:
-            app.update_current_location()
+            app.update_current_location(snapshot=snapshot)
             app.exec_task()
         return True
 
 
     # @processor.register_middleware()
     # @logger.catch
-    # def _handle_unexpected_modal(app: "AppProcessor"):
+    # def _handle_unexpected_modal(app: "AppProcessor", snapshot: "FrameSnapshot"):
     #     if app.latest_results.exists_label(base_labels.modal_header):
     #         modal_header = get_modal(app.latest_results, app.latest_frame, True)
     #         pass
@@ -37,14 +38,14 @@ def register_middlewares(processor: "AppProcessor"):
 
     @processor.register_middleware()
     @logger.catch
-    def _add_skill(app: "AppProcessor"):
+    def _add_skill(app: "AppProcessor", snapshot: "FrameSnapshot"):
         global last_card_name
         if app.game_status_manager.current_location == GamePageTypes.SUB_MENU.PRODUCER_ILLUSTRATED:
-            current_location = get_current_location(app.latest_results)
+            current_location = get_current_location(snapshot.results)
             if current_location != GamePageTypes.SUB_MENU.PRODUCER_ILLUSTRATED:
                 app.game_status_manager.current_location = current_location
                 return
-            roi , skill_card, card_info = extract_skill_card_and_info(app.latest_frame)
+            roi , skill_card, card_info = extract_skill_card_and_info(snapshot.frame)
             if skill_card is None or card_info is None:
                 return
             ocr_service = OCRService()
@@ -60,5 +61,5 @@ def register_middlewares(processor: "AppProcessor"):
             card_info = OCR_ResultList([item for item in card_info if len(item.text) > 2])
             skill_card_types = [base_labels.skill_card, base_labels.skill_card__mental, base_labels.skill_card__active, base_labels.skill_card__trap]
 
-            if not app.clip_manager.skill_card_clip.add_to_memory(skill_card, SkillCardInfo(card_title, app.latest_results.filter_by_labels(skill_card_types).get_y_min_element().first().label.replace("Skill Card: ", ""), [item.text for item in card_info]), 0.97):
+            if not app.clip_manager.skill_card_clip.add_to_memory(skill_card, SkillCardInfo(card_title, snapshot.results.filter_by_labels(skill_card_types).get_y_min_element().first().label.replace("Skill Card: ", ""), [item.text for item in card_info]), 0.97):
                 logger.debug(app.clip_manager.skill_card_clip.retrieve(skill_card))
\ No newline at end of file
@@ -90,6 +90,10 @@ class TaskQueue:
             self._worker_thread.start()
         return True
 
+    def is_running(self) -> bool:
+        """任务队列是否正在执行"""
+        return self._run_lock
+
     def _processor_task_queue(self):
         """任务队列处理器，确保任务按顺序执行"""
         while True:
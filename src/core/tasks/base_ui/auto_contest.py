@@ -2,7 +2,7 @@ from time import sleep
 
 from src.entity.Game.Components.Button import ButtonList
 from src.entity.Game.Components.CheckBox import CheckBox
-from src.entity.Game.Components.Contest import ContestList
+from src.entity.Game.Components.Contest import ContestList, CONTEST_LIST_SCOPE
 from src.entity.Game.Page.Types.index import GamePageTypes
 from src.constants import *
 from src.utils.logger import logger
@@ -29,8 +29,9 @@ def action__check_and_collect_rewards(app: "AppProcessor"):
     检查并领取上赛季奖励。
     奖励出现时通常位于屏幕下半部，通过点击领取。
     """
-    height, width = app.latest_frame.shape[:2]
-    items = app.latest_results.filter_by_label(base_labels.item)
+    snapshot = app.snapshot
+    height, width = snapshot.frame.shape[:2]
+    items = snapshot.results.filter_by_label(base_labels.item)
     items_cx, items_cy = items.get_COL()
     if items and (height // 2) < items_cy:
         app.app.click(items_cx, items_cy)
@@ -43,9 +44,10 @@ def action__loop_challenge_contest(app: "AppProcessor"):
     """
     持续挑战竞技场，直到没有可挑战对象为止。
     """
-    height, width = app.latest_frame.shape[:2]
     while True:
-        contest = ContestList(app.latest_results, app.latest_frame)
+        snapshot = app.snapshot
+        height, width = snapshot.frame.shape[:2]
+        contest = ContestList(app.detect(CONTEST_LIST_SCOPE, snapshot), snapshot.frame)
         if not contest:
             logger.info("There is no contest.")
             break
@@ -53,7 +55,7 @@ def action__loop_challenge_contest(app: "AppProcessor"):
         logger.info(f"try contest: {target}")
         app.app.click_element(target)
         sleep(1)
-        if app.latest_results.exists_label(base_labels.blank_slot):
+        if app.snapshot.results.exists_label(base_labels.blank_slot):
             _auto_form_team(app)
         _start_battle_and_skip(app, width, height)
         _finish_battle(app)
@@ -80,12 +82,12 @@ def _start_battle_and_skip(app: "AppProcessor", width: int, height: int):
     """
     app.click_button("挑戦開始")
     app.wait_for_label(base_labels.checkbox)
-    check_box = CheckBox(app.latest_results.filter_by_label(base_labels.checkbox).first())
+    check_box = CheckBox(app.snapshot.results.filter_by_label(base_labels.checkbox).first())
     if not check_box.checked:
         app.app.click_element(check_box)
     app.click_on_label(base_labels.skip_button)
     sleep(1)
-    while app.latest_results.exists_label(base_labels.skip_button):
+    while app.snapshot.results.exists_label(base_labels.skip_button):
         app.app.click(width // 2, height // 2)
         sleep(1)
     app.app.click(width // 2, height // 2)
@@ -97,9 +99,11 @@ def _finish_battle(app: "AppProcessor"):
     """
     COUNT, WAIT = 0, 15
     while COUNT < WAIT:
-        if app.latest_results.exists_label(base_labels.button):
+        snapshot = app.snapshot
+        if snapshot.results.exists_label(base_labels.button):
             break
-        app.app.click(app.latest_frame.shape[1] // 2, app.latest_frame.shape[0] // 2)
+        height, width = snapshot.frame.shape[:2]
+        app.app.click(width // 2, height // 2)
         sleep(1)
         COUNT += 1
     if COUNT >= WAIT:
@@ -107,7 +111,7 @@ def _finish_battle(app: "AppProcessor"):
     app.click_button("次へ")
     app.click_button("終了")
     sleep(1)
-    if app.latest_results.exists_label(base_labels.modal_header):
+    if app.snapshot.results.exists_label(base_labels.modal_header):
         modal = app.wait_for_modal("レート報酬", no_body=True)
         app.app.click_element(modal.cancel_button)
     app.wait__loading()
\ No newline at end of file
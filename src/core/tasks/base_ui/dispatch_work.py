@@ -7,9 +7,9 @@ from src.constants import *
 from src.entity.Game.Page.Types.index import GamePageTypes
 from src.entity.Yolo import Yolo_Box, Yolo_Results
 from src.utils.logger import logger
-from src.utils.ocr_instance import get_ocr
+from src.utils.ocr_instance import get_ocr, get_ocr_batch
 from src.utils.opencv_tools import check_color_in_region
-from src.utils.yolo_tools import get_modal
+from src.utils.yolo_tools import get_modal, MODAL_SCOPE
 
 if TYPE_CHECKING:
     from app import AppProcessor
@@ -20,7 +20,7 @@ def action__enter_dispatch_page(app: "AppProcessor"):
     """进入页面并收取历史派遣结果逻辑"""
     if not app.wait_for_label(base_labels.home_dispatch_work):
         raise TimeoutError("Timeout waiting for [home:dispatch work] to appear.")
-    app.app.click_element(app.latest_results.filter_by_label(base_labels.home_dispatch_work).first())
+    app.app.click_element(app.snapshot.results.filter_by_label(base_labels.home_dispatch_work).first())
     sleep(1)
     app.wait__loading()
 
@@ -31,7 +31,8 @@ def action__enter_dispatch_page(app: "AppProcessor"):
         if app.game_status_manager.current_location == GamePageTypes.HOME_TAB.WORK:
             return
         if app.wait_for_label(base_labels.modal_header, 3):
-            modal = get_modal(app.latest_results, app.latest_frame, True)
+            snapshot = app.snapshot
+            modal = get_modal(app.detect(MODAL_SCOPE, snapshot), snapshot.frame, True)
             app.app.click_element(modal.cancel_button)
             count += 1
             sleep(3)
@@ -40,25 +41,26 @@ def action__enter_dispatch_page(app: "AppProcessor"):
 
 def action__dispatch_all_available_work(app: "AppProcessor"):
     """派遣任务逻辑"""
-    height, width = app.latest_frame.shape[:2]
-    item_group = app.latest_results.filter_by_label(base_labels.item).group_yolo_boxes_by_position(10, width / 4)
-
-    if len(item_group) != MAX_WORKS:
-        raise RuntimeError("Error in calculating the range of the box body")
-
-    for group in item_group:
-        if _is_work_already_dispatched(app, group, width):
+    for index in range(MAX_WORKS):
+        # 每派遣一个任务后界面都会变化，每一步重新读取快照，任务分组与判断使用同一帧
+        snapshot = app.snapshot
+        width = snapshot.frame.shape[1]
+        item_group = snapshot.results.filter_by_label(base_labels.item).group_yolo_boxes_by_position(10, width / 4)
+        if len(item_group) != MAX_WORKS:
+            raise RuntimeError("Error in calculating the range of the box body")
+        group = item_group[index]
+        if _is_work_already_dispatched(snapshot.results, group, width):
             continue
         _dispatch_single_work(app, group)
         sleep(3)
         app.wait_for_label(base_labels.avatar, 10)
 
-def _is_work_already_dispatched(app: "AppProcessor", group, width):
-    """判断该任务是否已派遣"""
-    return group.get_vertical_range_elements(app.latest_results, width / 4).exists_label(base_labels.avatar)
+def _is_work_already_dispatched(results: Yolo_Results, group, width):
+    """判断该任务是否已派遣（results 与 group 应来自同一快照）"""
+    return group.get_vertical_range_elements(results, width / 4).exists_label(base_labels.avatar)
 
-def _is_avatar_busy(avatar, full_frame):
-    """判断角色是否“工作中”"""
+def _get_avatar_status_region(avatar, full_frame):
+    """角色头像上方“工作中”标志所在的区域"""
     h, w = full_frame.shape[:2]
 
     x1 = max(0, avatar.x - 15)
@@ -66,10 +68,12 @@ def _is_avatar_busy(avatar, full_frame):
     x2 = min(w, avatar.w)
     y2 = min(h, avatar.cy)
 
-    target_frame = full_frame[y1:y2, x1:x2]
+    return full_frame[y1:y2, x1:x2]
 
-    ocr_result = get_ocr(target_frame)
-    return "お仕事中" in [ocr_obj.text for ocr_obj in ocr_result]
+def _are_avatars_busy(avatars, full_frame):
+    """判断各角色是否“工作中”（所有头像一次批量识别）"""
+    ocr_results = get_ocr_batch([_get_avatar_status_region(avatar, full_frame) for avatar in avatars])
+    return ["お仕事中" in [ocr_obj.text for ocr_obj in ocr_result] for ocr_result in ocr_results]
 
 def _is_avatar_guaranteed_success(avatar):
     """判断角色是否带有标志“好調：大成功確定”"""
@@ -82,14 +86,14 @@ def _assign_avatar_to_work(app: "AppProcessor", avatar=None):
     if avatar:  # 当有头像元素时
         app.app.click_element(avatar)
         sleep(0.5)
-        app.app.click_element(app.latest_results.filter_by_label(base_labels.button).get_y_max_element().first())
+        app.app.click_element(app.snapshot.results.filter_by_label(base_labels.button).get_y_max_element().first())
         sleep(1)
         app.wait_for_label(base_labels.button)
 
     duration_box = _select_work_duration(app)
     app.app.click_element(duration_box)
     sleep(1)
-    app.app.click_element(app.latest_results.filter_by_label(base_labels.button).get_y_max_element().first())
+    app.app.click_element(app.snapshot.results.filter_by_label(base_labels.button).get_y_max_element().first())
     sleep(1)
 
     modal = app.wait_for_modal("仕事開始確", 10, no_body=True)
@@ -98,18 +102,19 @@ def _assign_avatar_to_work(app: "AppProcessor", avatar=None):
 
 def _select_work_duration(app: "AppProcessor"):
     """选择工作时长"""
-    frame_h, frame_w = app.latest_frame.shape[:2]
+    snapshot = app.snapshot
+    frame_h, frame_w = snapshot.frame.shape[:2]
     y_start = frame_h // 2
-    y_end = int(app.latest_results.filter_by_label(base_labels.button).get_y_max_element().first().y)
+    y_end = int(snapshot.results.filter_by_label(base_labels.button).get_y_max_element().first().y)
     y_end = min(frame_h, max(y_start + 1, y_end))
-    frame = app.latest_frame[y_start:y_end, 0:frame_w]
+    frame = snapshot.frame[y_start:y_end, 0:frame_w]
 
     ocr_results = get_ocr(frame)
     selects = ["4時間", "8時間", "12時間"]
     candidates = [
         Yolo_Box(
             x := o.x, y := y_start + o.y, w := x + o.w, h := y + o.h,
-            f"button__{o.text}", app.latest_frame[y:h, x:w]
+            f"button__{o.text}", snapshot.frame[y:h, x:w]
         )
         for o in ocr_results if o.text in selects
     ]
@@ -121,10 +126,11 @@ def _dispatch_single_work(app: "AppProcessor", group):
     sleep(1)
     app.wait_for_label(base_labels.avatar)
     def _exec():
-        avatars = app.latest_results.filter_by_label(base_labels.avatar)
+        snapshot = app.snapshot
+        avatars = snapshot.results.filter_by_label(base_labels.avatar)
         avatars = Yolo_Results.from_boxes([avatar for avatar in avatars if avatar.x >= 10])
-        for avatar in avatars:
-            if _is_avatar_busy(avatar, app.latest_frame):
+        for avatar, busy in zip(avatars, _are_avatars_busy(avatars, snapshot.frame)):
+            if busy:
                 logger.debug("Skip 'お仕事中' avatar")
                 continue
             if _is_avatar_guaranteed_success(avatar):
@@ -132,7 +138,7 @@ def _dispatch_single_work(app: "AppProcessor", group):
                 return True
         return False
     if not _exec():
-        x, y = app.latest_results.filter_by_label(base_labels.avatar).get_COL()
+        x, y = app.snapshot.results.filter_by_label(base_labels.avatar).get_COL()
         app.app.scrollY(x, y, -10)
         sleep(0.5)
         if _exec():
@@ -5,7 +5,7 @@ from time import sleep
 from src.constants import *
 from src.constants.base_ui import labels
 from src.entity.Game.Page.Types.index import GamePageTypes
-from src.utils.yolo_tools import get_modal
+from src.utils.yolo_tools import get_modal, MODAL_SCOPE
 
 
 def action__click_start_game(app: "app.AppProcessor", timeout=30):
@@ -18,8 +18,9 @@ def action__click_start_game(app: "app.AppProcessor", timeout=30):
 
 def handle__network_error_modal_boxes(app: "app.AppProcessor"):
     """处理：通信错误模态框"""
-    if app.latest_results.filter_by_label(labels.modal_header):
-        modal = get_modal(app.latest_results, app.latest_frame)
+    snapshot = app.snapshot
+    if snapshot.results.filter_by_label(labels.modal_header):
+        modal = get_modal(app.detect(MODAL_SCOPE, snapshot), snapshot.frame)
         if modal.modal_title == modal_text.connection_error:
             if modal_text.ConnectionError_Body.Token_Fail in modal.modal_body:
                 app.app.click_element(modal.cancel_button)
@@ -35,19 +36,20 @@ def handle__network_error_modal_boxes(app: "app.AppProcessor"):
 def action__check_home_tab_exist(app: "app.AppProcessor", timeout=30):
     """动作：检查主界面标识是否存在"""
     count = 0
-    if app.latest_results.exists_label(labels.tab_home):
+    if app.snapshot.results.exists_label(labels.tab_home):
         return True
     while count < timeout:
-        if close_btn := app.latest_results.filter_by_label(labels.close_button):
+        if close_btn := app.snapshot.results.filter_by_label(labels.close_button):
             app.app.click_element(close_btn.first())
             sleep(2)
-        if skip_btn := app.latest_results.filter_by_label(labels.skip_button):
+        snapshot = app.snapshot
+        if skip_btn := snapshot.results.filter_by_label(labels.skip_button):
             app.app.click_element(skip_btn.first())
             sleep(2)
-        elif app.latest_results.exists_label(labels.tab_home):
+        elif snapshot.results.exists_label(labels.tab_home):
             return True
         else:
-            height, width = app.latest_frame.shape[:2]
+            height, width = snapshot.frame.shape[:2]
             app.app.click(width // 2, height // 2)
             count += 3
             sleep(3)
@@ -35,7 +35,7 @@ def register_tasks(processor: "AppProcessor"):
     @logger.catch
     def _task__start_game(app: "AppProcessor"):
         TIMEOUT = 30
-        if not (app.game_status_manager.current_location == GamePageTypes.START_GAME or app.latest_results.exists_label(base_labels.start_menu_logo)):
+        if not (app.game_status_manager.current_location == GamePageTypes.START_GAME or app.snapshot.results.exists_label(base_labels.start_menu_logo)):
             return
         if action__click_start_game(app, TIMEOUT) is not False:
             sleep(2)
@@ -51,14 +51,14 @@ def register_tasks(processor: "AppProcessor"):
         app.wait__loading()
         if not app.wait_for_label(base_labels.home_get_expenditure):
             raise TimeoutError("Timeout waiting for [home:expenditure] to appear.")
-        app.app.click_element(app.latest_results.filter_by_label(base_labels.home_get_expenditure).first())
+        app.app.click_element(app.snapshot.results.filter_by_label(base_labels.home_get_expenditure).first())
         sleep(3)
         if modal := app.wait_for_modal("活動費", no_body=True, timeout=10):
             print(modal)
             app.app.click_element(modal.cancel_button)
             sleep(3)
             return True
-        elif app.latest_results.exists_label(base_labels.tab_home):
+        elif app.snapshot.results.exists_label(base_labels.tab_home):
             logger.warning("There are no claimable expenses")
             return True
         raise TimeoutError("Timeout waiting for modal to appear.")
@@ -92,9 +92,11 @@ def register_tasks(processor: "AppProcessor"):
         app.click_button("パック")
         app.update_current_location(GamePageTypes.HOME_TAB.SHOP_SUB_PAGE.PACK)
         sleep(3)
-        height, width = app.latest_frame.shape[:2]
         for _ in range(3):
-            buttons = ButtonList(app.latest_results)
+            snapshot = app.snapshot
+            height, width = snapshot.frame.shape[:2]
+            buttons = ButtonList(snapshot.results)
+            buttons.load_texts()
             for button in buttons:
                 if "無料" in button.text and button.is_disabled() is False:
                     app.app.click_element(button)
@@ -113,7 +115,8 @@ def register_tasks(processor: "AppProcessor"):
         commodity_target = ["アノマリーノート"]
         while True:
             full_memory = True
-            item_commodity = app.latest_results.filter_by_labels([base_labels.item,base_labels.card__commodity])
+            snapshot = app.snapshot
+            item_commodity = snapshot.results.filter_by_labels([base_labels.item,base_labels.card__commodity])
             item_commodity_group = item_commodity.find_containing_groups(base_labels.card__commodity, [base_labels.item])
             # print(item_exchanges)
             ocr_service = OCRService()
@@ -166,14 +169,15 @@ def register_tasks(processor: "AppProcessor"):
         app.wait__loading()
         app.click_on_label(base_labels.home_daily_task)
         app.wait_for_label(base_labels.tab_bar)
-        tab_bar = TabBar(app.latest_results.filter_by_label(base_labels.tab_bar).first())
+        snapshot = app.snapshot
+        tab_bar = TabBar(snapshot.results.filter_by_label(base_labels.tab_bar).first())
         logger.debug(tab_bar)
-        height, width = app.latest_frame.shape[:2]
+        height, width = snapshot.frame.shape[:2]
         frame_cx = width // 2
         for tab in tab_bar:
             app.app.click_element(tab)
             sleep(3)
-            buttons = app.latest_results.filter_by_label(base_labels.button)
+            buttons = app.snapshot.results.filter_by_label(base_labels.button)
             flag = False
             for button in buttons:
                 if frame_cx - 10 < button.cx < frame_cx + 10 and not Button(button).is_disabled():
@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields
 from typing import List
 
 import cv2
@@ -6,15 +8,83 @@ import numpy as np
 
 from src.entity.Yolo import Yolo_Box, Yolo_Results
 from src.constants import *
-from src.utils.ocr_instance import get_ocr
+from src.utils.ocr_instance import get_ocr, get_ocr_batch
+
+# 文字尚未识别的标记
+_UNRECOGNIZED = object()
+# 按钮文字记忆：按位置（网格量化）记录最近识别出的文字，作为下一帧查找按钮时的先验
+_TEXT_MEMORY_SIZE = 256
+_TEXT_MEMORY_GRID = 16
+_text_memory: "OrderedDict[tuple, str]" = OrderedDict()
+_text_memory_lock = threading.Lock()
+
+
+def _memory_key(box: Yolo_Box) -> tuple:
+    return (box.label,) + tuple(round(value / _TEXT_MEMORY_GRID) for value in (box.x, box.y, box.w, box.h))
 
 
 @dataclass
 class Button(Yolo_Box):
-    text: str | None
+    # _text: 按钮文字，首次访问 text 时识别
+    __slots__ = ("_text",)
     def __init__(self, element: Yolo_Box, no_text = False):
-        super().__init__(element.x, element.y, element.w, element.h, element.label, element.frame)
-        self.text = None if no_text else "".join([item.text for item in get_ocr(element.frame)])
+        """
+        :param element: 按钮目标框
+        :param no_text: 不识别按钮文字（text 为None）
+        """
+        super().__init__(element.x, element.y, element.w, element.h, element.label, element._crop,
+                         element.model_type, source=element.source_frame)
+        # 按钮常在源帧被环形缓冲区淘汰后才使用（识别文字、判断禁用状态），创建时即复制图像区域
+        self.retain()
+        self._text = None if no_text else _UNRECOGNIZED
+
+    @property
+    def text(self) -> str | None:
+        """按钮文字（首次访问时OCR识别并缓存）"""
+        if self._text is _UNRECOGNIZED:
+            self.text = "".join([item.text for item in get_ocr(self.frame, rec_only=True)])
+        return self._text
+
+    @text.setter
+    def text(self, text: str | None):
+        self._text = text
+        if text is not None:
+            key = _memory_key(self)
+            with _text_memory_lock:
+                _text_memory[key] = text
+                _text_memory.move_to_end(key)
+                while len(_text_memory) > _TEXT_MEMORY_SIZE:
+                    _text_memory.popitem(last=False)
+
+    def _values(self) -> tuple:
+        """参与比较与显示的属性值（目标框字段 + 已识别的按钮文字，不触发OCR）"""
+        return tuple(getattr(self, field.name) for field in fields(Yolo_Box)) + (self._text,)
+
+    # text 为属性而非 dataclass 字段，需显式实现以保留按钮文字
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self._values() == other._values()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        names = [field.name for field in fields(Yolo_Box)] + ["text"]
+        values = [f"{name}={value!r}" for name, value in zip(names, self._values())]
+        if not self.recognized:
+            values[-1] = "text=<unrecognized>"
+        return f"{self.__class__.__qualname__}({', '.join(values)})"
+
+    @property
+    def recognized(self) -> bool:
+        """文字是否已识别"""
+        return self._text is not _UNRECOGNIZED
+
+    @property
+    def remembered_text(self) -> str | None:
+        """之前的帧中同一位置的按钮识别出的文字（不进行OCR），没有记录时为None"""
+        with _text_memory_lock:
+            return _text_memory.get(_memory_key(self))
 
     def is_disabled(self):
         h, w = self.frame.shape[:2]
@@ -67,6 +137,7 @@ class ButtonList:
     buttons: List[Button]
 
     def __init__(self, yolo_results: Yolo_Results):
+        # 按钮文字在首次访问时才识别
         self.buttons = [Button(el) for el in yolo_results.filter_by_label(base_labels.button)]
 
     def __bool__(self):
@@ -84,8 +155,35 @@ class ButtonList:
         inst.buttons = buttons
         return inst
 
+    def load_texts(self, buttons: List[Button] | None = None):
+        """
+        批量识别尚未识别文字的按钮（多个按钮共用一次OCR调用）
+        :param buttons: 需要识别的按钮，为None时识别全部按钮
+        """
+        pending = [button for button in (self.buttons if buttons is None else buttons) if not button.recognized]
+        if not pending:
+            return
+        for button, ocr_results in zip(pending, get_ocr_batch([button.frame for button in pending], rec_only=True)):
+            button.text = "".join([item.text for item in ocr_results])
+
     def get_button_by_text(self, text) -> Button | None:
+        """
+        查找文字包含 text 的按钮：上一帧同位置文字匹配的按钮优先逐个识别，找到即返回；
+        其余按钮（没有记录的在前，记录不匹配的在后）一次批量识别后按顺序查找
+        """
+        likely, unknown, unlikely = [], [], []
         for button in self.buttons:
+            remembered = button.remembered_text
+            if remembered is None:
+                unknown.append(button)
+            else:
+                (likely if text in remembered else unlikely).append(button)
+        for button in likely:
+            if text in button.text:
+                return button
+        rest = unknown + unlikely
+        self.load_texts(rest)
+        for button in rest:
             if text in button.text:
                 return button
         return None
\ No newline at end of file
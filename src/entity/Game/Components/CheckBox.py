@@ -11,5 +11,6 @@ class CheckBox(Yolo_Box):
     checked: bool
 
     def __init__(self, element: Yolo_Box):
-        super().__init__(element.x, element.y, element.w, element.h, "CheckBox", element.frame)
+        super().__init__(element.x, element.y, element.w, element.h, "CheckBox", element._crop,
+                         element.model_type, source=element.source_frame)
         self.checked = check_status_detection(element.frame)
\ No newline at end of file
@@ -5,21 +5,30 @@ from typing import List
 import cv2
 import numpy as np
 
+from src.core.inference.scope import DetectionScope
 from src.entity.Yolo import Yolo_Box, Yolo_Results
 from src.utils.logger import logger
-from src.utils.ocr_instance import get_ocr, OCR_Result
+from src.utils.ocr_instance import get_ocr, get_ocr_batch, OCR_Result
 from src.constants import *
 
+# 定位对手列表区域所需的标签（调用方通过 AppProcessor.detect 按该范围检测后传入 ContestList）
+CONTEST_LIST_SCOPE = DetectionScope(labels=(base_labels.button, base_labels.back_btn), name="contest_list")
 
 @dataclass
 class ContestItem(Yolo_Box):
+    __slots__ = ("combat_power", "pt", "username")
     combat_power: int
     pt: int
     username: str
 
-    def __init__(self, x: float, y: float, w: float, h: float, label: str, frame: np.ndarray):
+    def __init__(self, x: float, y: float, w: float, h: float, label: str, frame: np.ndarray,
+                 ocr_result: List[OCR_Result] | None = None):
+        """
+        :param ocr_result: 已识别的OCR结果（批量识别时传入），为None时对 frame 进行识别
+        """
         super().__init__(x, y, w, h, label, frame)
-        ocr_result = get_ocr(frame)
+        if ocr_result is None:
+            ocr_result = get_ocr(frame)
         # logger.debug(f"ocr_result: {ocr_result}")
         # [OCR_Result(x=514, y=0, w=89, h=24, text='+139p+', confidence=0.8393095135688782), OCR_Result(x=30, y=32, w=104, h=23, text='総合力合計', confidence=0.999838650226593), OCR_Result(x=26, y=71, w=165, h=32, text='106980', confidence=0.9857919216156006), OCR_Result(x=20, y=128, w=80, h=22, text='ふ一ちや', confidence=0.8578659892082214)]
         self._parse_ocr_results(ocr_result)
@@ -59,6 +68,7 @@ class ContestList:
         _, self._width = frame.shape[:2]
         self._start_y = results.filter_by_label(base_labels.button).get_y_max_element().first().h
         self._end_y = results.filter_by_label(base_labels.back_btn).first().y
+        self.contests = []
         self.contest_area = frame[self._start_y:self._end_y, 0:self._width]
         if not [res for res in get_ocr(self.contest_area) if "消費しました" in res.text]:
             self._get_contest_items()
@@ -75,8 +85,9 @@ class ContestList:
     def __bool__(self):
         return bool(self.contests)
 
-    def _append_contest(self, x: float, y: float, w: float, h: float, frame: np.ndarray):
-        self.contests.append(ContestItem(x, y, w, h, f"contest_{len(self.contests) + 1}",frame))
+    def _append_contest(self, x: float, y: float, w: float, h: float, frame: np.ndarray,
+                        ocr_result: List[OCR_Result] | None = None):
+        self.contests.append(ContestItem(x, y, w, h, f"contest_{len(self.contests) + 1}", frame, ocr_result))
 
     def _get_contest_items(self):
         target_color = np.array([123,130,131])
@@ -84,13 +95,17 @@ class ContestList:
         # 查找轮廓
         contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         # 依次提取每个区域
+        regions = []
         for cnt in contours:
             x, y, w, h = cv2.boundingRect(cnt)
 
             # 筛选条件 宽度必须大于帧宽度的一半
             if w > self._width//2 and h > 10:
-                roi = self.contest_area[y:y+h, x:x+w]
-                self._append_contest(x, box_y := self._start_y+y, x+w, box_y+h, roi)
+                regions.append((x, y, w, h, self.contest_area[y:y+h, x:x+w]))
+        # 所有对手卡片一次批量识别
+        ocr_results = get_ocr_batch([roi for *_, roi in regions])
+        for (x, y, w, h, roi), ocr_result in zip(regions, ocr_results):
+            self._append_contest(x, box_y := self._start_y+y, x+w, box_y+h, roi, ocr_result)
 
     def _get_valid_contests(self) -> List[ContestItem]:
         return [r for r in self.contests if r.combat_power is not None]
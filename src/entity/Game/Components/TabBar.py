@@ -11,6 +11,7 @@ from src.utils.opencv_tools import check_status_detection
 
 @dataclass
 class TabBarItem(Yolo_Box):
+    __slots__ = ("text",)
     text: str
     def __init__(self, x: float, y: float, w: float, h: float, text: str, body_element: Yolo_Box):
         self.text = text
@@ -22,7 +23,10 @@ class TabBar(Yolo_Box):
     tab_items: List[TabBarItem]
     selected: TabBarItem = None
     def __init__(self, element: Yolo_Box):
-        super().__init__(element.x, element.y, element.w, element.h, element.label, element.frame)
+        super().__init__(element.x, element.y, element.w, element.h, element.label, element._crop,
+                         element.model_type, source=element.source_frame)
+        # 标签栏在任务中长期使用，创建时即复制图像区域
+        self.retain()
         w, h = element.frame.shape[:2]
         el_cy = h // 2
         self.tab_items = [
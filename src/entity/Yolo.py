@@ -1,15 +1,53 @@
+import threading
+import weakref
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import List, Tuple, Union, Optional
+from math import inf
+from typing import List, Tuple, Union, Optional, Dict, TYPE_CHECKING
 
 import numpy as np
 from ultralytics import YOLO
 
 from src.utils.number import median
 
+if TYPE_CHECKING:
+    from src.core.inference.scope import DetectionScope
+
 class YoloModelType:
     BASE_UI: str = 'BASE_UI'
     PRODUCER: str = 'PRODUCER'
 
+
+# 仍被引用的完整帧：id → (弱引用, 字节数)
+_live_frames: Dict[int, Tuple[weakref.ReferenceType, int]] = {}
+
+
+def _track_frame(frame: np.ndarray):
+    """登记完整帧，用于统计仍被引用的帧"""
+    key = id(frame)
+    entry = _live_frames.get(key)
+    if entry is not None and entry[0]() is frame:
+        return
+
+    def _release(ref, key=key):
+        if (current := _live_frames.get(key)) is not None and current[0] is ref:
+            del _live_frames[key]
+
+    _live_frames[key] = (weakref.ref(frame, _release), frame.nbytes)
+
+
+def get_frame_memory_report() -> dict:
+    """
+    完整帧内存报告：仍被引用（未释放）的完整帧数量及占用
+    :return: {"live_frames": 帧数, "live_frame_mb": 占用(MB)}
+    """
+    entries = list(_live_frames.values())
+    return {
+        "live_frames": len(entries),
+        "live_frame_mb": round(sum(nbytes for _, nbytes in entries) / 1024 / 1024, 2)
+    }
+
+
 @dataclass
 class Yolo_Box:
     """
@@ -18,27 +56,83 @@ class Yolo_Box:
     Attributes:
         x, y, w, h: 框的位置和尺寸。
         label: 类别标签。
-        frame: 框住的图像区域帧。
+        frame: 框住的图像区域帧（属性）。显式传入的图像会被直接保存；只传入源帧时按需从源帧裁剪，
+            且只持有源帧的弱引用，源帧释放后需要继续使用的框应先调用 retain()。
         cx, cy: 框中心点坐标。
+        model_type: 产生该框的模型类型（标签命名空间），非模型产生的框为None。
+        track_id: 跟踪模式下的稳定目标ID，未跟踪时为None。
     """
+    # 每帧会创建大量实例，使用 __slots__ 去掉实例 __dict__；子类需同样声明 __slots__
+    # _crop: 显式保存的图像区域；_source: 源帧（完整帧）的弱引用
+    __slots__ = ("x", "y", "w", "h", "label", "cx", "cy", "model_type", "track_id", "_crop", "_source")
     x: float
     y: float
     w: float
     h: float
     label: str
-    frame: np.ndarray
     cx: int
     cy: int
+    model_type: str | None
+    track_id: int | None
 
-    def __init__(self, x: float, y: float, w: float, h: float, label: str, frame: np.ndarray):
+    def __init__(self, x: float, y: float, w: float, h: float, label: str, frame: np.ndarray | None,
+                 model_type: str | None = None, source: np.ndarray | None = None):
+        """
+        :param frame: 框住的图像区域，为None时从 source 按需裁剪
+        :param model_type: 产生该框的模型类型
+        :param source: 源帧（完整帧），只保存弱引用
+        """
         self.x = x
         self.y = y
         self.w = w
         self.h = h
         self.label = label
-        self.frame = frame
+        self._crop = frame
+        self._source = weakref.ref(source) if source is not None else None
         self.cx = int(median(self.x, self.w))
         self.cy = int(median(self.y, self.h))
+        self.model_type = model_type
+        self.track_id = None
+
+    @property
+    def frame(self) -> np.ndarray | None:
+        """框住的图像区域帧"""
+        if self._crop is not None:
+            return self._crop
+        if self._source is None:
+            return None
+        if (source := self._source()) is None:
+            raise ReferenceError(f"Source frame of {self.label} has been released, call retain() to keep the crop")
+        return source[int(self.y):int(self.h), int(self.x):int(self.w)]
+
+    @frame.setter
+    def frame(self, frame: np.ndarray | None):
+        self._crop = frame
+        self._source = None
+
+    @property
+    def source_frame(self) -> np.ndarray | None:
+        """源帧（完整帧），未设置或已释放时为None"""
+        return self._source() if self._source is not None else None
+
+    def retain(self) -> "Yolo_Box":
+        """
+        复制图像区域并释放对源帧的引用（copy-on-retain），目标框需要在帧释放后继续使用时调用
+        :return: self
+        """
+        if self._crop is None:
+            if (source := self.source_frame) is not None:
+                self._crop = source[int(self.y):int(self.h), int(self.x):int(self.w)].copy()
+        elif self._crop.base is not None:
+            # 显式传入的图像是完整帧的视图，同样会持有完整帧
+            self._crop = self._crop.copy()
+        self._source = None
+        return self
+
+    @property
+    def namespaced_label(self) -> str:
+        """带模型命名空间的标签，如 "PRODUCER/General Item" """
+        return f"{self.model_type}/{self.label}" if self.model_type else self.label
 
     def __eq__(self, other):
         """
@@ -59,41 +153,373 @@ class Yolo_Box:
     def get_COL(self) -> Tuple[int, int]:
         return self.cx, self.cy
 
+def _object_array(items) -> np.ndarray:
+    """构建一维 object 数组（避免 numpy 将元素展开为多维）"""
+    array = np.empty(len(items), dtype=object)
+    for index, item in enumerate(items):
+        array[index] = item
+    return array
+
+
+class _LabelBits:
+    """全局标签 → 位编号注册表，用于构建标签存在位图"""
+    _bits: Dict[str, int] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, label: str) -> int:
+        """获取标签对应的位（首次出现时分配）"""
+        bit = cls._bits.get(label)
+        if bit is None:
+            with cls._lock:
+                bit = cls._bits.setdefault(label, 1 << len(cls._bits))
+        return bit
+
+    @classmethod
+    def find(cls, label: str) -> int:
+        """获取标签对应的位，未注册的标签返回0"""
+        return cls._bits.get(label, 0)
+
+
+class _MinSegmentTree:
+    """区间最小值线段树（单点更新，区间查询）"""
+
+    def __init__(self, size: int):
+        self._size = size
+        self._tree = [inf] * (2 * size)
+
+    def update(self, position: int, value):
+        position += self._size
+        self._tree[position] = value
+        position >>= 1
+        while position:
+            self._tree[position] = min(self._tree[2 * position], self._tree[2 * position + 1])
+            position >>= 1
+
+    def query(self, low: int, high: int):
+        """区间 [low, high) 的最小值，空区间返回 inf"""
+        result = inf
+        low += self._size
+        high += self._size
+        while low < high:
+            if low & 1:
+                result = min(result, self._tree[low])
+                low += 1
+            if high & 1:
+                high -= 1
+                result = min(result, self._tree[high])
+            low >>= 1
+            high >>= 1
+        return result
+
+
+class _ContainmentTree:
+    """
+    一帧全部目标框的包含关系（容器 → 被包含的框），首次查询时构建，
+    由同一帧派生的所有 Yolo_Results 共享。
+
+    包含判断与 find_containing_groups 一致：container.x <= other.x, container.y <= other.y,
+    container.x + container.w >= other.x + other.w, container.y + container.h >= other.y + other.h，
+    与容器相同的框不计入。
+    """
+
+    def __init__(self, xyxy: np.ndarray, labels: np.ndarray):
+        self._xyxy = xyxy
+        self._labels = labels
+        self._children: List[np.ndarray] | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._labels)
+
+    def children(self, index: int) -> np.ndarray:
+        """被指定框包含的全部框的下标（升序）"""
+        if self._children is None:
+            with self._lock:
+                if self._children is None:
+                    self._children = self._build()
+        return self._children[index]
+
+    def _build(self) -> List[np.ndarray]:
+        xyxy, labels = self._xyxy, self._labels
+        order = np.argsort(xyxy[:, 0], kind='stable')
+        sorted_x = xyxy[order, 0]
+        children = []
+        for index, (x, y, w, h) in enumerate(xyxy.tolist()):
+            # 被包含框满足 other.x + other.w <= x + w，且 other.w >= 0，先按 x 坐标二分出候选
+            candidates = order[np.searchsorted(sorted_x, x, side='left'):np.searchsorted(sorted_x, x + w, side='right')]
+            cx1, cy1, cx2, cy2 = xyxy[candidates].T
+            inside = ((y <= cy1) & (x + w >= cx1 + cx2) & (y + h >= cy1 + cy2)
+                      & ~((xyxy[candidates] == (x, y, w, h)).all(axis=1) & (labels[candidates] == labels[index])))
+            children.append(np.sort(candidates[inside]))
+        return children
+
+
 @dataclass
 class Yolo_Results:
     """
     YOLO检测结果封装类，用于提取、筛选和分组Yolo_Box。
-    
+
+    结果按列存储（坐标、标签、置信度、模型类型），筛选与范围查询使用向量化掩码，
+    Yolo_Box 对象只在访问 boxes / 迭代时按需创建，并在派生结果之间共享。
+
     Attributes:
         results: 原始YOLO模型结果。
-        boxes: 提取后的目标框列表。
+        region: 推理时的裁剪区域 (x1, y1, x2, y2)，为None表示整帧推理。
+        scope: 推理时使用的检测范围（可通过 scope.name 区分请求方），为None表示流水线的整帧推理。
     """
     results: any
-    boxes: list[Yolo_Box]
-    def __init__(self, yolo_results, model: YOLO, frame: np.array):
+    region: Tuple[int, int, int, int] | None
+    scope: Optional["DetectionScope"]
+    # 列：(x1, y1, x2, y2) 坐标、标签、置信度、模型类型、已创建的 Yolo_Box（未创建为None）
+    _xyxy: np.ndarray
+    _labels: np.ndarray
+    _conf: np.ndarray
+    _model_types: np.ndarray
+    _objs: np.ndarray
+    # 完整帧：结果存活期间持有该帧，Yolo_Box 只持有弱引用并按需从该帧裁剪图像区域
+    _frame: np.ndarray | None
+    # 标签 → 行区间 [start, stop)（按标签排序，同一标签的框连续存放），首次查询时构建
+    _label_index: Dict[str, Tuple[int, int]] | None
+    # 标签存在位图（各标签位的或）
+    _label_mask: int
+    # 空间索引：坐标轴 → (按该坐标排序的行下标, 排序后的坐标值)，首次查询时构建
+    _spatial_index: Dict[str, Tuple[np.ndarray, np.ndarray]]
+    # 分组结果缓存：(row_thresh, col_thresh, mode, margin) → 分组
+    _group_cache: Dict[tuple, List["Yolo_Results"]]
+
+    # 包含关系树（同一帧共享）及每行在树中的下标
+    _scene: _ContainmentTree
+    _scene_idx: np.ndarray
+
+    _COLUMNS = ("_xyxy", "_labels", "_conf", "_model_types", "_objs", "_scene_idx")
+    # 框数达到该值时才使用空间索引（二分查找）；每帧通常只有10-100个框，直接扫描更快
+    _INDEX_MIN_SIZE = 256
+
+    def __init__(self, yolo_results, model: YOLO, frame: np.array,
+                 region: Tuple[int, int, int, int] | None = None):
+        """
+        :param yolo_results: 原始YOLO模型结果
+        :param model: 推理模型（提供类别名称）
+        :param frame: 完整图像帧
+        :param region: 推理时的裁剪区域，框坐标会映射回完整帧坐标
+        """
         self.results = list(yolo_results)
-        self.boxes = []
+        self.region = region
+        self.scope = None
+        self._frame = frame
+        _track_frame(frame)
+        model_type = getattr(model, 'model_type', None)
+        names = model.names
+        name_table = np.array([names[class_id] for class_id in range(max(names) + 1)] if names else [''])
+        xyxy_parts, label_parts, conf_parts = [], [], []
         for result in self.results:
-            if not hasattr(result, 'boxes'):
+            if getattr(result, 'boxes', None) is None or not len(result.boxes):
                 continue
-            for box in result.boxes:
-                class_id = int(box.cls)
-                class_name = model.names[class_id]
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                self.boxes.append(Yolo_Box(x1, y1, x2, y2, class_name, frame[y1:y2, x1:x2]))
-        self.boxes.sort(key=lambda box: (box.label, box.x, box.y))
+            # 一次性将整个结果张量拷贝到主机：[x1, y1, x2, y2, (track_id), conf, cls]
+            data = result.boxes.data.cpu().numpy()
+            xyxy_parts.append(data[:, :4].astype(np.int32))
+            conf_parts.append(data[:, -2].astype(np.float32))
+            label_parts.append(name_table[data[:, -1].astype(np.int64)])
+        if xyxy_parts:
+            xyxy = np.concatenate(xyxy_parts)
+            if region:
+                xyxy += np.array([region[0], region[1], region[0], region[1]], dtype=np.int32)
+            labels = np.concatenate(label_parts)
+            conf = np.concatenate(conf_parts)
+        else:
+            xyxy, labels, conf = np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=str), np.empty(0, dtype=np.float32)
+        count = len(labels)
+        model_types = np.full(count, model_type, dtype=object)
+        self._set_columns(xyxy, labels, conf, model_types, np.full(count, None, dtype=object), np.arange(count))
+        self._sort()
+        self._new_scene()
+
+    def _set_columns(self, *columns):
+        """设置全部列（顺序同 _COLUMNS），并清除标签索引"""
+        for name, column in zip(self._COLUMNS, columns):
+            setattr(self, name, column)
+        self._label_index = None
+        self._spatial_index = {}
+        self._group_cache = {}
+
+    def _sort(self):
+        """按 (label, x, y) 排序"""
+        if len(self._labels) > 1:
+            order = np.lexsort((self._xyxy[:, 1], self._xyxy[:, 0], self._labels))
+            self._set_columns(*(getattr(self, column)[order] for column in self._COLUMNS))
+
+    def _new_scene(self):
+        """以当前的框作为一帧的全部框，创建新的包含关系树"""
+        self._scene = _ContainmentTree(self._xyxy, self._labels)
+        self._scene_idx = np.arange(len(self._labels))
+
+    def _take(self, index) -> "Yolo_Results":
+        """
+        按下标（或布尔掩码）派生新的结果，保持原有顺序，已创建的 Yolo_Box 会被共享
+        """
+        if not isinstance(index, slice):
+            index = np.asarray(index)
+            if index.dtype == bool:
+                index = np.flatnonzero(index)
+        inst = self.__class__.__new__(self.__class__)
+        inst.results = []
+        inst.region = None
+        inst.scope = self.scope
+        inst._frame = self._frame
+        inst._scene = self._scene
+        inst._set_columns(*(getattr(self, column)[index] for column in self._COLUMNS))
+        return inst
+
+    def _copy(self) -> "Yolo_Results":
+        """
+        浅拷贝（列为视图，共享已创建的 Yolo_Box）：remove_by_label、boxes 赋值等修改方法
+        只会替换拷贝的列，不会影响原结果
+        """
+        return self._take(slice(None))
+
+    def _slice(self, start: int, stop: int) -> "Yolo_Results":
+        """派生连续区间 [start, stop) 的结果（列为视图，不拷贝）"""
+        return self._take(slice(start, stop))
+
+    def _box(self, index: int) -> Yolo_Box:
+        """获取（必要时创建）指定下标的 Yolo_Box"""
+        box = self._objs[index]
+        if box is None:
+            x1, y1, x2, y2 = (int(value) for value in self._xyxy[index])
+            box = Yolo_Box(x1, y1, x2, y2, str(self._labels[index]), None, self._model_types[index],
+                           source=self._frame)
+            self._objs[index] = box
+        return box
+
+    def _get_label_index(self) -> Dict[str, Tuple[int, int]]:
+        """获取标签 → 行区间索引（首次调用时构建，同时计算标签存在位图）"""
+        if self._label_index is None:
+            labels = self._labels
+            count = len(labels)
+            if count:
+                starts = np.r_[0, np.flatnonzero(labels[1:] != labels[:-1]) + 1]
+                stops = np.r_[starts[1:], count]
+                names = labels[starts].tolist()
+                index = dict(zip(names, zip(starts.tolist(), stops.tolist())))
+            else:
+                names, index = [], {}
+            mask = 0
+            for name in names:
+                mask |= _LabelBits.get(name)
+            self._label_mask = mask
+            self._label_index = index
+        return self._label_index
+
+    def _axis_values(self, axis: str) -> np.ndarray:
+        """获取指定坐标轴的值（按原有顺序）"""
+        if axis == 'cx':
+            return self.cx
+        if axis == 'cy':
+            return self.cy
+        return self._xyxy[:, ('x1', 'y1', 'x2', 'y2').index(axis)]
+
+    def _get_axis(self, axis: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        获取按指定坐标排序的 (行下标, 坐标值)，首次调用时构建
+        :param axis: 'x1', 'y1', 'x2', 'y2', 'cx', 'cy'
+        """
+        if (entry := self._spatial_index.get(axis)) is None:
+            values = self._axis_values(axis)
+            order = np.argsort(values, kind='stable')
+            entry = self._spatial_index[axis] = (order, values[order])
+        return entry
+
+    def _range(self, axis: str, low, high) -> np.ndarray:
+        """
+        查找坐标在 [low, high] 内的行下标（按原有顺序），框数较少时直接扫描，否则二分查找
+        :param axis: 坐标轴，见 _get_axis
+        """
+        if len(self._labels) < self._INDEX_MIN_SIZE:
+            values = self._axis_values(axis)
+            return np.flatnonzero((values >= low) & (values <= high))
+        order, values = self._get_axis(axis)
+        start = np.searchsorted(values, low, side='left')
+        stop = np.searchsorted(values, high, side='right')
+        return np.sort(order[start:stop])
+
+    @property
+    def label_mask(self) -> int:
+        """标签存在位图"""
+        self._get_label_index()
+        return self._label_mask
+
+    def _materialize(self):
+        """创建全部 Yolo_Box"""
+        for index in range(len(self._labels)):
+            self._box(index)
+
+    @property
+    def boxes(self) -> List[Yolo_Box]:
+        """目标框列表（按需创建 Yolo_Box）"""
+        return [self._box(index) for index in range(len(self._labels))]
+
+    def retain(self) -> "Yolo_Results":
+        """
+        复制全部目标框的图像区域并释放对完整帧的引用（结果需要长期保存时调用）
+        :return: self
+        """
+        for box in self.boxes:
+            box.retain()
+        self._frame = None
+        return self
+
+    @boxes.setter
+    def boxes(self, boxes: List[Yolo_Box]):
+        other = self.from_boxes(boxes)
+        self._frame = other._frame
+        self._set_columns(*(getattr(other, column) for column in self._COLUMNS))
+        self._scene = other._scene
+
+    @property
+    def xyxy(self) -> np.ndarray:
+        """(N, 4) 坐标数组 (x1, y1, x2, y2)"""
+        return self._xyxy
+
+    @property
+    def labels(self) -> np.ndarray:
+        """(N,) 标签数组"""
+        return self._labels
+
+    @property
+    def conf(self) -> np.ndarray:
+        """(N,) 置信度数组（由已有 Yolo_Box 构建的框为NaN）"""
+        return self._conf
+
+    @property
+    def cx(self) -> np.ndarray:
+        """(N,) 中心点X坐标数组"""
+        return ((self._xyxy[:, 0] + self._xyxy[:, 2]) / 2).astype(np.int64)
+
+    @property
+    def cy(self) -> np.ndarray:
+        """(N,) 中心点Y坐标数组"""
+        return ((self._xyxy[:, 1] + self._xyxy[:, 3]) / 2).astype(np.int64)
 
     def __bool__(self):
-        return bool(self.boxes)
+        return len(self._labels) > 0
 
     def __len__(self):
-        return len(self.boxes)
+        return len(self._labels)
 
     def __iter__(self):
         return iter(self.boxes)
 
     def __getitem__(self, index):
-        return self.from_boxes(self.boxes[index])
+        return self._take(np.atleast_1d(np.arange(len(self._labels))[index]))
+
+    def __eq__(self, other):
+        if isinstance(other, Yolo_Results):
+            return self.boxes == other.boxes
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Yolo_Results(boxes={self.boxes!r}, region={self.region!r})"
 
     @classmethod
     def from_boxes(cls, boxes: List[Yolo_Box]) -> "Yolo_Results":
@@ -102,15 +528,56 @@ class Yolo_Results:
         """
         inst = cls.__new__(cls)
         inst.results = []
-        inst.boxes = boxes
-        inst.boxes.sort(key=lambda box: (box.label, box.x, box.y))
+        inst.region = None
+        inst.scope = None
+        # 所有框来自同一源帧时持有该帧，保证结果存活期间可以按需裁剪
+        sources = {id(source): source for box in boxes if (source := box.source_frame) is not None}
+        inst._frame = sources.popitem()[1] if len(sources) == 1 else None
+        inst._set_columns(
+            np.array([(box.x, box.y, box.w, box.h) for box in boxes]).reshape(-1, 4),
+            np.array([box.label for box in boxes], dtype=str),
+            np.full(len(boxes), np.nan, dtype=np.float32),
+            _object_array([box.model_type for box in boxes]),
+            _object_array(boxes),
+            np.arange(len(boxes))
+        )
+        inst._sort()
+        inst._new_scene()
+        return inst
+
+    @classmethod
+    def merge(cls, results_list: List["Yolo_Results"]) -> "Yolo_Results":
+        """
+        合并多个模型在同一帧上的推理结果
+        """
+        if not results_list:
+            return cls.from_boxes([])
+        inst = cls.__new__(cls)
+        frames = {id(results._frame) for results in results_list if len(results)}
+        if len(frames) > 1:
+            # 来自不同帧的结果需要先创建 Yolo_Box 并复制图像区域，合并后不再依赖帧
+            for results in results_list:
+                for box in results.boxes:
+                    box.retain()
+            inst._frame = None
+        else:
+            inst._frame = next((results._frame for results in results_list if len(results)), None)
+        inst._set_columns(*(np.concatenate([getattr(results, column) for results in results_list])
+                            for column in cls._COLUMNS))
+        inst._sort()
+        inst._new_scene()
+        inst.results = [result for results in results_list for result in results.results]
+        regions = {results.region for results in results_list}
+        inst.region = regions.pop() if len(regions) == 1 else None
+        scopes = {results.scope for results in results_list}
+        inst.scope = scopes.pop() if len(scopes) == 1 else None
         return inst
 
     def first(self):
-        return self.boxes[0]
+        return self._box(0)
 
     def index(self, index):
-        return self.boxes[index]
+        return self._box(index)
 
     def filter_by_label(self, label: str) -> "Yolo_Results":
         """
@@ -122,7 +589,20 @@ class Yolo_Results:
         Returns:
             返回符合条件的Yolo_Results实例
         """
-        return self.from_boxes([box for box in self.boxes if box.label == label])
+        start, stop = self._get_label_index().get(label, (0, 0))
+        return self._slice(start, stop)
+
+    def filter_by_model(self, model_type: str) -> "Yolo_Results":
+        """
+        按产生目标框的模型类型筛选（用于融合推理结果）。
+
+        Args:
+            model_type: YoloModelType
+
+        Returns:
+            返回符合条件的Yolo_Results实例
+        """
+        return self._take(self._model_types == model_type)
 
     def filter_by_labels(self, labels: List[str]) -> "Yolo_Results":
         """
@@ -134,9 +614,13 @@ class Yolo_Results:
         Returns:
             所有匹配标签的 Yolo_Results实例，可能为空
         """
-        return self.from_boxes(
-            [box for box in self.boxes if box.label in labels]
-        )
+        index = self._get_label_index()
+        # 按区间起点排序，保持原有顺序
+        spans = sorted(index[label] for label in set(labels) if label in index)
+        if len(spans) == 1:
+            return self._slice(*spans[0])
+        return self._take(np.concatenate([np.arange(start, stop) for start, stop in spans])
+                          if spans else np.empty(0, dtype=np.int64))
 
     def remove_by_label(self, label: str) -> None:
         """
@@ -145,7 +629,14 @@ class Yolo_Results:
         Args:
             label: 要移除的标签名。
         """
-        self.boxes = [box for box in self.boxes if box.label != label]
+        if (span := self._get_label_index().get(label)) is None:
+            return
+        keep = np.r_[0:span[0], span[1]:len(self._labels)]
+        self._set_columns(*(getattr(self, column)[keep] for column in self._COLUMNS))
+
+    def _keys(self) -> List[tuple]:
+        """每个框的 (x1, y1, x2, y2, label)，与 Yolo_Box 的相等判断一致"""
+        return [(*xyxy, label) for xyxy, label in zip(self._xyxy.tolist(), self._labels.tolist())]
 
     def remove_by_yolo_results(self, other_yolo_results: "Yolo_Results") -> "Yolo_Results":
         """
@@ -154,8 +645,8 @@ class Yolo_Results:
         Args:
             other_yolo_results: 要删除的 Yolo_Results 对象。
         """
-        other_boxes = set(other_yolo_results.boxes)
-        return self.from_boxes([box for box in self.boxes if box not in other_boxes])
+        other_keys = set(other_yolo_results._keys())
+        return self._take(np.array([key not in other_keys for key in self._keys()], dtype=bool))
 
     def remove_by_yolo_box(self, yolo_box: Yolo_Box) -> "Yolo_Results":
         """
@@ -164,7 +655,22 @@ class Yolo_Results:
         Args:
             yolo_box: 要移除的 Yolo_Box 对象。
         """
-        return self.from_boxes([box for box in self.boxes if box != yolo_box])
+        same = ((self._xyxy == (yolo_box.x, yolo_box.y, yolo_box.w, yolo_box.h)).all(axis=1)
+                & (self._labels == yolo_box.label))
+        return self._take(~same)
+
+    def select(self, selector) -> "Yolo_Results":
+        """
+        使用选择器查询目标框，如 results.select('button below "Universal Modal Header" rightmost')
+
+        Args:
+            selector: 选择器文本或已编译的 Selector（见 src.utils.selector）
+
+        Returns:
+            选中的目标框
+        """
+        from src.utils.selector import select
+        return select(self, selector)
 
     def exists_label(self, label: str) -> bool:
         """
@@ -172,7 +678,10 @@ class Yolo_Results:
         :param label: 标签名
         :return:
         """
-        return any(b.label == label for b in self.boxes)
+        # 先构建标签索引：本结果中的标签在此时注册位，之后仍未注册的标签必然不存在
+        mask = self.label_mask
+        bit = _LabelBits.find(label)
+        return bool(bit) and bool(mask & bit)
 
     def exists_all_labels(self, labels: List[str]) -> bool:
         """
@@ -184,32 +693,37 @@ class Yolo_Results:
         Returns:
             True 表示全部标签都存在，False 表示有任意一个不存在
         """
-        existing_labels = {box.label for box in self.boxes}
-        return all(label in existing_labels for label in labels)
+        mask = self.label_mask
+        required = 0
+        for label in labels:
+            if not (bit := _LabelBits.find(label)):
+                return False
+            required |= bit
+        return mask & required == required
 
     def get_y_min_element(self) -> Optional["Yolo_Results"]:
         """返回Y轴最小的元素（最靠上）"""
-        if not self.boxes:
+        if not self:
             return None
-        return self.from_boxes([min(self.boxes, key=lambda box: box.y)])
+        return self._take([np.argmin(self._xyxy[:, 1])])
 
     def get_y_max_element(self) -> Optional["Yolo_Results"]:
         """返回Y轴最小的元素（最靠下）"""
-        if not self.boxes:
+        if not self:
             return None
-        return self.from_boxes([max(self.boxes, key=lambda box: box.h)])
+        return self._take([np.argmax(self._xyxy[:, 3])])
 
     def get_x_min_element(self) -> Optional["Yolo_Results"]:
         """返回X轴最小的元素（最靠左）"""
-        if not self.boxes:
+        if not self:
             return None
-        return self.from_boxes([min(self.boxes, key=lambda box: box.x)])
+        return self._take([np.argmin(self._xyxy[:, 0])])
 
     def get_x_max_element(self) -> Optional["Yolo_Results"]:
         """"返回X轴最大的元素（最靠右）"""
-        if not self.boxes:
+        if not self:
             return None
-        return self.from_boxes([max(self.boxes, key=lambda box: box.w)])
+        return self._take([np.argmax(self._xyxy[:, 2])])
 
     def get_center_x_range_element(self, x_value, range_: int) -> "Yolo_Results":
         """
@@ -218,9 +732,7 @@ class Yolo_Results:
         :param range_: 范围
         :return:
         """
-        return self.from_boxes(
-            [el for el in self.boxes if el.cx - range_ <= x_value <= el.cx + range_]
-        )
+        return self._take(self._range('cx', x_value - range_, x_value + range_))
 
     def get_y_range_element(self, y_value, range_: int) -> "Yolo_Results":
         """
@@ -229,9 +741,7 @@ class Yolo_Results:
         :param range_: 范围
         :return:
         """
-        return self.from_boxes(
-            [el for el in self.boxes if el.cy - range_ <= y_value <= el.cy + range_]
-        )
+        return self._take(self._range('cy', y_value - range_, y_value + range_))
 
     def match_rows_with(self, other_boxes: list[Yolo_Box], tolerance_ratio: float = 0.5) -> list[
         tuple[Yolo_Box, Yolo_Box]]:
@@ -245,18 +755,32 @@ class Yolo_Results:
         Returns:
             在同一行的元素对列表。
         """
-        same_row_pairs = []
-
-        for box1 in self.boxes:
-            for box2 in other_boxes:
-                # 计算允许的误差阈值（基于较小的按钮高度）
-                tolerance = min(box1.h, box2.h) * tolerance_ratio
-
-                # 判断两个按钮是否在同一行
-                if abs(box1.y - box2.y) <= tolerance:
-                    same_row_pairs.append((box1, box2))
-
-        return same_row_pairs
+        if not self or not other_boxes:
+            return []
+        if len(self._labels) < self._INDEX_MIN_SIZE:
+            # 框数较少时直接计算全部配对
+            other = np.array([(box.y, box.h) for box in other_boxes])
+            tolerance = np.minimum(self._xyxy[:, 3, None], other[None, :, 1]) * tolerance_ratio
+            rows, cols = np.nonzero(np.abs(self._xyxy[:, 1, None] - other[None, :, 0]) <= tolerance)
+            return [(self._box(i), other_boxes[j]) for i, j in zip(rows.tolist(), cols.tolist())]
+        rows, cols = [], []
+        for j, box in enumerate(other_boxes):
+            # 误差阈值不超过 box.h * tolerance_ratio，先按 y 坐标二分出候选
+            reach = box.h * tolerance_ratio
+            candidates = self._range('y1', box.y - reach, box.y + reach)
+            if not len(candidates):
+                continue
+            # 计算允许的误差阈值（基于较小的按钮高度）
+            tolerance = np.minimum(self._xyxy[candidates, 3], box.h) * tolerance_ratio
+            # 判断两个按钮是否在同一行
+            hits = candidates[np.abs(self._xyxy[candidates, 1] - box.y) <= tolerance]
+            rows.append(hits)
+            cols.append(np.full(len(hits), j))
+        if not rows:
+            return []
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        order = np.lexsort((cols, rows))
+        return [(self._box(i), other_boxes[j]) for i, j in zip(rows[order].tolist(), cols[order].tolist())]
 
     def group_yolo_boxes_by_position(
             self,
@@ -273,70 +797,82 @@ class Yolo_Results:
         :param margin: 边框大小容差（像素）
         :return: 分组后的Yolo_Results对象列表
         """
+        key = (row_thresh, col_thresh, mode, margin)
+        if (grouped := self._group_cache.get(key)) is None:
+            grouped = self._group_cache[key] = self._group_by_position(row_thresh, col_thresh, mode, margin)
+        # 返回各分组的拷贝，调用方修改分组（remove_by_label、boxes 赋值、retain）不会影响缓存
+        return [group._copy() for group in grouped]
 
-        for box in self.boxes:
-            box.cx, box.cy = box.get_COL()
-
-        boxes_to_process = self.boxes
+    def _split_rows(self, row_thresh, mode: str, margin: int) -> List[List[int]]:
+        """
+        扫描线分行，结果与逐行比较参考框（每行第一个框）的方式一致，按行创建顺序返回各行的行下标
+        """
+        rows: List[List[int]] = []
+        if mode == 'center':
+            cy = self.cy
+            # 按 cy 升序处理，新行的参考框 cy 不小于已有各行，参考值列表保持升序，
+            # 第一个满足 ref.cy ∈ [cy - row_thresh, cy - max(0, -margin)] 的行即为匹配行
+            min_gap = max(0, -margin)
+            refs = []
+            for index in np.argsort(cy, kind='stable').tolist():
+                value = cy[index]
+                row = bisect_left(refs, value - row_thresh)
+                if row < len(refs) and refs[row] <= value - min_gap:
+                    rows[row].append(index)
+                else:
+                    refs.append(value)
+                    rows.append([index])
+        else:
+            # 匹配条件 ref.y + ref.h ∈ [box.y - row_thresh, box.y + margin]，参考值不随创建顺序单调，
+            # 在全部候选参考值的有序序列上用线段树查询区间内最早创建的行
+            y1 = self._xyxy[:, 1]
+            keys = y1 + self._xyxy[:, 3]
+            key_order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[key_order].tolist()
+            positions = np.empty(len(keys), dtype=np.int64)
+            positions[key_order] = np.arange(len(keys))
+            tree = _MinSegmentTree(len(keys))
+            for index in np.argsort(y1, kind='stable').tolist():
+                value = y1[index]
+                row = tree.query(bisect_left(sorted_keys, value - row_thresh), bisect_right(sorted_keys, value + margin))
+                if row < inf:
+                    rows[row].append(index)
+                else:
+                    tree.update(int(positions[index]), len(rows))
+                    rows.append([index])
+        return rows
 
+    def _group_by_position(self, row_thresh, col_thresh, mode: str, margin: int) -> List["Yolo_Results"]:
+        if not self:
+            return []
         # ===== 分行 =====
         if row_thresh is not None:
-            if mode == 'center':
-                boxes_sorted = sorted(boxes_to_process, key=lambda b: b.cy)
-            else:
-                boxes_sorted = sorted(boxes_to_process, key=lambda b: b.y)
-
-            rows = []
-            for box in boxes_sorted:
-                matched = False
-                for row in rows:
-                    ref = row[0]
-                    if mode == 'center':
-                        y_dist = abs(box.cy - ref.cy)
-                    else:
-                        y_dist = box.y - (ref.y + ref.h)
-
-                    if -margin <= y_dist <= row_thresh:
-                        row.append(box)
-                        matched = True
-                        break
-                if not matched:
-                    rows.append([box])
+            rows = self._split_rows(row_thresh, mode, margin)
         else:
             # 不分行，视为一整行
-            rows = [boxes_to_process]
+            rows = [list(range(len(self)))]
 
+        x1, x2 = self._xyxy[:, 0], self._xyxy[:, 2]
+        cx = self.cx
         grouped: List["Yolo_Results"] = []
-
         for row in rows:
+            row = np.array(row, dtype=np.int64)
             # ===== 分列 =====
-            if col_thresh is not None:
-                if mode == 'center':
-                    row_sorted = sorted(row, key=lambda b: b.cx)
-                else:
-                    row_sorted = sorted(row, key=lambda b: b.x)
-
-                group = [row_sorted[0]]
-                for prev, curr in zip(row_sorted, row_sorted[1:]):
-                    if mode == 'center':
-                        x_dist = curr.get_COL()[0] - prev.get_COL()[0]
-                    else:
-                        x_dist = curr.x - (prev.x + prev.w)
-
-                    if -margin <= x_dist <= col_thresh:
-                        group.append(curr)
-                    else:
-                        grouped.append(self.from_boxes(group))
-                        group = [curr]
-                grouped.append(self.from_boxes(group))
-            else:
+            if col_thresh is None:
                 # 不分列，整行为一个组
-                grouped.append(self.from_boxes(row))
-
+                grouped.append(self._take(np.sort(row)))
+                continue
+            if mode == 'center':
+                row = row[np.argsort(cx[row], kind='stable')]
+                x_dist = np.diff(cx[row])
+            else:
+                row = row[np.argsort(x1[row], kind='stable')]
+                x_dist = x1[row][1:] - (x1[row][:-1] + x2[row][:-1])
+            breaks = np.flatnonzero(~((x_dist >= -margin) & (x_dist <= col_thresh))) + 1
+            for group in np.split(row, breaks):
+                grouped.append(self._take(np.sort(group)))
         return grouped
 
-
-
     def find_containing_groups(
             self,
             container_label: str,
@@ -358,45 +894,37 @@ class Yolo_Results:
             include_labels = [include_labels]
 
         result_groups = []
-
-        for container in self.boxes:
-            if container.label != container_label:
-                continue
-
-            included = []
-            for other in self.boxes:
-                if other == container or other.label not in include_labels:
-                    continue
-
-                # 判断是否被包含（边界在容器内部）
-                if (container.x <= other.x and
-                        container.y <= other.y and
-                        container.x + container.w >= other.x + other.w and
-                        container.y + container.h >= other.y + other.h):
-                    included.append(other)
+        start, stop = self._get_label_index().get(container_label, (0, 0))
+        if start == stop:
+            return result_groups
+        if relation not in ("all", "or"):
+            raise ValueError(f"不支持的 relation 类型: {relation}（应为 'all' 或 'or'）")
+
+        include_label_set = set(include_labels)
+        is_included_label = np.isin(self._labels, list(include_label_set))
+        # 包含关系树中的下标 → 本结果中的行（不在本结果中为-1）
+        row_of = np.full(len(self._scene), -1, dtype=np.int64)
+        row_of[self._scene_idx] = np.arange(len(self))
+        for index in range(start, stop):
+            rows = row_of[self._scene.children(self._scene_idx[index])]
+            rows = rows[rows >= 0]
+            included = rows[is_included_label[rows]]
 
             if relation == "all":
-                include_label_set = set(include_labels)
-                matched_labels = {box.label for box in included}
-                if include_label_set.issubset(matched_labels):
-                    result_groups.append(self.from_boxes([container] + included))
-            elif relation == "or":
-                if included:
-                    result_groups.append(self.from_boxes([container] + included))
-            else:
-                raise ValueError(f"不支持的 relation 类型: {relation}（应为 'all' 或 'or'）")
+                if include_label_set.issubset(set(self._labels[included].tolist())):
+                    result_groups.append(self._take(np.sort(np.r_[index, included])))
+            elif len(included):
+                result_groups.append(self._take(np.sort(np.r_[index, included])))
 
         return result_groups
 
 
     def get_COL(self) -> Tuple[float, float]:
         """获取集合的中心点"""
-        if not self.boxes:
+        if not self:
             raise ValueError("The number of boxes is 0, and the center point cannot be obtained")
-        min_x = min(box.x for box in self.boxes)
-        max_x = max(box.w for box in self.boxes)
-        min_y = min(box.y for box in self.boxes)
-        max_y = max(box.h for box in self.boxes)
+        min_x, min_y = self._xyxy[:, :2].min(axis=0).tolist()
+        max_x, max_y = self._xyxy[:, 2:].max(axis=0).tolist()
         center_x = (min_x + max_x) / 2
         center_y = (min_y + max_y) / 2
         return int(center_x), int(center_y)
@@ -404,6 +932,4 @@ class Yolo_Results:
     def get_vertical_range_elements(self, all_boxes: "Yolo_Results", x_tolerance: float) -> "Yolo_Results":
         """获取与本组垂直对齐的其他框"""
         center_x, _ = self.get_COL()
-        return self.from_boxes([
-            box for box in all_boxes.boxes if abs(box.get_COL()[0] - center_x) <= x_tolerance
-        ])
\ No newline at end of file
+        return all_boxes.get_center_x_range_element(center_x, x_tolerance)
\ No newline at end of file
@@ -3,6 +3,7 @@ from typing import List
 import cv2
 import numpy as np
 
+from src.core.inference.scope import DetectionScope
 from src.entity.Yolo import Yolo_Results, Yolo_Box
 from src.constants import *
 from src.entity.Game.Page.Types.index import GamePageTypes
@@ -10,6 +11,16 @@ from src.utils.logger import logger
 from src.utils.ocr_instance import get_ocr
 from src.utils.opencv_tools import check_status_detection, get_mask_contours, extract_roi_from_mask
 
+# 判断当前位置所需的标签（AppProcessor.update_current_location 按该范围检测）
+CURRENT_LOCATION_SCOPE = DetectionScope(
+    labels=(
+        base_labels.start_menu_logo, base_labels.general_loading1, base_labels.general_loading2,
+        base_labels.tab_communicate, base_labels.tab_idol, base_labels.tab_home,
+        base_labels.tab_gacha, base_labels.tab_contest, base_labels.current_location,
+    ),
+    name="current_location"
+)
+
 
 @logger.catch
 def get_current_location(boxes: Yolo_Results) -> str | None:
@@ -1,7 +1,14 @@
+import atexit
+import os
+import pickle
 import re
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import List
+from hashlib import blake2b
+from typing import List, Callable
 
+import cv2
 import numpy as np
 import threading
 from paddleocr import PaddleOCR
@@ -10,6 +17,7 @@ from src.utils.number import median
 
 @dataclass
 class OCR_Result:
+    __slots__ = ("x", "y", "w", "h", "cx", "cy", "text", "confidence")
     x: float
     y: float
     w: float
@@ -167,14 +175,366 @@ class OCR_ResultList:
         return self._from(matched_results)
 
 
+def _create_engine() -> PaddleOCR:
+    return PaddleOCR(
+        lang='japan',
+        # use_angle_cls=False,
+        show_log=False
+    )
+
+
+class OCREnginePool:
+    """
+    OCR引擎池：进程内共享的 PaddleOCR 实例，首次使用时才加载模型，
+    最多创建 size 个实例供并发调用者使用，实例全部被占用时等待归还。
+
+    Attributes:
+        size: 最大引擎实例数。
+        created: 已创建的引擎实例数。
+        waits: 因实例全部被占用而等待的次数。
+    """
+    size: int
+    created: int = 0
+    waits: int = 0
+    _factory: Callable[[], PaddleOCR]
+    _idle: List[PaddleOCR]
+    _condition: threading.Condition
+
+    def __init__(self, size: int = 1, factory: Callable[[], PaddleOCR] = _create_engine):
+        self.size = max(1, size)
+        self._factory = factory
+        self._idle = []
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def acquire(self):
+        """
+        在上下文内独占一个引擎实例
+        """
+        with self._condition:
+            if not self._idle and self.created >= self.size:
+                self.waits += 1
+                self._condition.wait_for(lambda: self._idle or self.created < self.size)
+            if self._idle:
+                engine = self._idle.pop()
+            else:
+                engine = None
+                self.created += 1
+                index = self.created
+        if engine is None:
+            # 加载模型较慢，不持有锁
+            try:
+                engine = self._factory()
+            except BaseException:
+                with self._condition:
+                    self.created -= 1
+                    self._condition.notify()
+                raise
+            logger.debug(f"OCR engine created ({index}/{self.size})")
+        try:
+            yield engine
+        finally:
+            with self._condition:
+                self._idle.append(engine)
+                self._condition.notify()
+
+
+_ocr_pool: OCREnginePool | None = None
+_ocr_pool_lock = threading.Lock()
+
+
+def init_ocr_pool(size: int) -> OCREnginePool:
+    """
+    设置进程内共享的OCR引擎池容量（启动时调用，已创建的引擎不会重复加载）
+    :param size: 最大引擎实例数
+    :return: OCREnginePool
+    """
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            _ocr_pool = OCREnginePool(size)
+        else:
+            with _ocr_pool._condition:
+                _ocr_pool.size = max(1, size)
+                _ocr_pool._condition.notify_all()
+        return _ocr_pool
+
+
+def get_ocr_pool() -> OCREnginePool:
+    """获取进程内共享的OCR引擎池（未初始化时使用单个实例）"""
+    if _ocr_pool is None:
+        return init_ocr_pool(1)
+    return _ocr_pool
+
+
+class OCRCache:
+    """
+    OCR结果缓存：以图像内容的 blake2b 哈希为键，相同像素的裁剪图直接返回上次的识别结果，
+    超出容量时淘汰最久未使用的条目。开启持久化时，启动时加载、退出时保存到 model/OCR。
+
+    Attributes:
+        max_entries: 最大条目数。
+        file_path: 持久化文件路径，为None表示不持久化。
+        hits: 命中次数。
+        misses: 未命中次数。
+    """
+    max_entries: int
+    file_path: str | None
+    hits: int = 0
+    misses: int = 0
+    _entries: "OrderedDict[bytes, tuple]"
+    _lock: threading.Lock
+
+    def __init__(self, max_entries: int = 2048, file_path: str | None = None):
+        self.max_entries = max(1, max_entries)
+        self.file_path = file_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if file_path:
+            self._load()
+
+    @staticmethod
+    def key(img: np.ndarray, mode: str = "") -> bytes:
+        """
+        计算图像内容的哈希键
+        :param img: 图像
+        :param mode: 识别模式（不同模式的结果分别缓存）
+        :return:
+        """
+        digest = blake2b(digest_size=16)
+        digest.update(f"{mode}|{img.shape}|{img.dtype}".encode())
+        digest.update(np.ascontiguousarray(img).data)
+        return digest.digest()
+
+    def get(self, key: bytes) -> List[OCR_Result] | None:
+        """查询缓存，未命中返回None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return [OCR_Result(*item) for item in entry]
+
+    def put(self, key: bytes, results: List[OCR_Result]):
+        """写入缓存"""
+        entry = tuple((item.x, item.y, item.w, item.h, item.text, item.confidence) for item in results)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_stats(self) -> dict:
+        """获取缓存统计"""
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 4)}
+
+    def _load(self):
+        """加载持久化的缓存"""
+        if not os.path.exists(self.file_path):
+            return
+        try:
+            with open(self.file_path, 'rb') as f:
+                entries = pickle.load(f)
+        except Exception:
+            logger.exception(f"Failed to load OCR cache from {self.file_path}")
+            return
+        for key, entry in list(entries.items())[-self.max_entries:]:
+            self._entries[key] = entry
+        logger.info(f"Loaded {len(self._entries)} OCR cache entries from {self.file_path}")
+
+    def save(self):
+        """保存缓存到本地"""
+        if not self.file_path:
+            return
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        with self._lock:
+            entries = OrderedDict(self._entries)
+        with open(self.file_path, 'wb') as f:
+            pickle.dump(entries, f)
+
+
+_ocr_cache: OCRCache | None = None
+
+
+def init_ocr_cache(max_entries: int, persist: bool = False) -> OCRCache | None:
+    """
+    启用进程内共享的OCR结果缓存（启动时调用）
+    :param max_entries: 最大条目数，为0时不启用缓存
+    :param persist: 是否持久化到 model/OCR/ocr_cache.pkl
+    :return: OCRCache，未启用时返回None
+    """
+    global _ocr_cache
+    if max_entries <= 0:
+        _ocr_cache = None
+        return None
+    file_path = os.path.join(os.getcwd(), "model/OCR", "ocr_cache.pkl") if persist else None
+    _ocr_cache = OCRCache(max_entries, file_path)
+    if persist:
+        atexit.register(_ocr_cache.save)
+    return _ocr_cache
+
+
+def get_ocr_cache() -> OCRCache | None:
+    """获取进程内共享的OCR结果缓存，未启用时返回None"""
+    return _ocr_cache
+
+
+# 仅识别模式的最低置信度，低于该值（或未识别出文字）时回退到完整OCR（检测 + 识别）
+REC_ONLY_MIN_CONFIDENCE = 0.8
+# 缓存命名空间：engine.ocr 的结果与批量识别（自行检测、裁剪、排序）的结果不保证完全一致，分开缓存
+_CACHE_MODE_OCR = ""
+_CACHE_MODE_BATCH = "batch"
+_CACHE_MODE_REC = "rec"
+# 批量识别依赖 PaddleOCR 2.x 的内部属性
+_BATCH_ATTRIBUTES = ("text_detector", "text_recognizer")
+_batch_fallback_warned = False
+
+
+def _recognize(img: np.ndarray, pool: OCREnginePool, rec_only: bool = False) -> List[OCR_Result]:
+    """识别图像中的文字，优先使用OCR结果缓存"""
+    if rec_only:
+        return _recognize_batch([img], pool, rec_only)[0]
+    return _ocr(img, pool)
+
+
+def _ocr(img: np.ndarray, pool: OCREnginePool, engine=None) -> List[OCR_Result]:
+    """
+    使用 engine.ocr 完整识别（检测 + 识别），优先使用OCR结果缓存
+    :param engine: 调用方已从引擎池获取的引擎，为None时从 pool 获取
+    """
+    cache = _ocr_cache
+    key = cache.key(img, _CACHE_MODE_OCR) if cache is not None else None
+    if cache is not None and (results := cache.get(key)) is not None:
+        return results
+    if engine is None:
+        with pool.acquire() as engine:
+            result = engine.ocr(img, cls=False)
+    else:
+        result = engine.ocr(img, cls=False)
+    results = OCRService._map_result_to_ocr_result(result)
+    if cache is not None:
+        cache.put(key, results)
+    return results
+
+
+def _sort_quads(quads: np.ndarray) -> List[np.ndarray]:
+    """将文本框按从上到下、从左到右排序（与 PaddleOCR 的排序规则一致）"""
+    boxes = sorted(quads, key=lambda quad: (quad[0][1], quad[0][0]))
+    for i in range(len(boxes) - 1):
+        for j in range(i, -1, -1):
+            if abs(boxes[j + 1][0][1] - boxes[j][0][1]) < 10 and boxes[j + 1][0][0] < boxes[j][0][0]:
+                boxes[j], boxes[j + 1] = boxes[j + 1], boxes[j]
+            else:
+                break
+    return boxes
+
+
+def _crop_quad(img: np.ndarray, quad: np.ndarray) -> np.ndarray:
+    """按四边形文本框透视裁剪出水平的文本行图像（与 PaddleOCR 的裁剪方式一致）"""
+    points = np.asarray(quad, dtype=np.float32)
+    width = int(max(np.linalg.norm(points[0] - points[1]), np.linalg.norm(points[2] - points[3])))
+    height = int(max(np.linalg.norm(points[0] - points[3]), np.linalg.norm(points[1] - points[2])))
+    target = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    crop = cv2.warpPerspective(img, cv2.getPerspectiveTransform(points, target), (width, height),
+                               borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC)
+    if crop.shape[0] * 1.0 / crop.shape[1] >= 1.5:
+        crop = np.rot90(crop)
+    return crop
+
+
+def _to_bgr(img: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR) if img.ndim == 2 else img
+
+
+def _recognize_batch(images: List[np.ndarray], pool: OCREnginePool,
+                     rec_only: bool = False) -> List[List[OCR_Result]]:
+    """
+    批量识别多张图像中的文字：逐张检测文本框，所有文本行合并为一次识别调用
+    （识别模型按 rec_batch_num 分批推理），缓存命中的图像不再识别。
+    OCR引擎没有 PaddleOCR 2.x 的 text_detector / text_recognizer 属性时，逐张回退到 engine.ocr
+    :param images: 图像列表
+    :param pool: OCR引擎池
+    :param rec_only: 仅识别模式，图像本身作为一个文本行直接识别（跳过文本检测），
+                     置信度低于 REC_ONLY_MIN_CONFIDENCE 的图像回退到完整OCR
+    :return: 与 images 一一对应的识别结果
+    """
+    cache = _ocr_cache
+    outputs: List[List[OCR_Result] | None] = [None] * len(images)
+    keys = {}
+    for index, img in enumerate(images):
+        if img is None or img.size == 0:
+            logger.warning(f"Empty images or dimensions are illegal: {img.shape if img is not None else 'None'}")
+            outputs[index] = []
+        elif cache is not None:
+            keys[index] = cache.key(img, _CACHE_MODE_REC if rec_only else _CACHE_MODE_BATCH)
+            outputs[index] = cache.get(keys[index])
+    pending = [index for index, output in enumerate(outputs) if output is None]
+    if not pending:
+        return outputs
+    with pool.acquire() as engine:
+        if not all(hasattr(engine, name) for name in _BATCH_ATTRIBUTES):
+            global _batch_fallback_warned
+            if not _batch_fallback_warned:
+                _batch_fallback_warned = True
+                logger.warning("OCR engine does not expose text_detector/text_recognizer, "
+                               "falling back to per-image engine.ocr")
+            for index in pending:
+                outputs[index] = _ocr(images[index], pool, engine)
+            return outputs
+        detect = pending
+        if rec_only:
+            detect = []
+            recognized, _ = engine.text_recognizer([_to_bgr(images[index]) for index in pending])
+            for index, (text, confidence) in zip(pending, recognized):
+                if text and confidence >= REC_ONLY_MIN_CONFIDENCE:
+                    height, width = images[index].shape[:2]
+                    outputs[index] = [OCR_Result(0, 0, width, height, text, confidence)]
+                else:
+                    detect.append(index)
+        # PaddleOCR 的文本检测器每次只接受一张图像，检测逐张进行，只有识别合并为批量调用
+        lines, owners, crops = [], [], []
+        for index in detect:
+            img = _to_bgr(images[index])
+            outputs[index] = []
+            quads, _ = engine.text_detector(img)
+            if quads is None or not len(quads):
+                continue
+            for quad in _sort_quads(quads):
+                lines.append(quad)
+                owners.append(index)
+                crops.append(_crop_quad(img, quad))
+        recognized, _ = engine.text_recognizer(crops) if crops else ([], 0)
+        drop_score = getattr(engine, 'drop_score', 0.5)
+    for quad, index, (text, confidence) in zip(lines, owners, recognized):
+        if confidence >= drop_score:
+            outputs[index].append(OCR_Result(*OCRService._quad_to_rect(np.asarray(quad).tolist()), text=text, confidence=confidence))
+    if cache is not None:
+        for index in pending:
+            cache.put(keys[index], outputs[index])
+    return outputs
+
+
 class OCRService:
-    ocr_engine: PaddleOCR
-    def __init__(self):
-        self.ocr_engine = PaddleOCR(
-            lang='japan',
-            # use_angle_cls=False,
-            show_log=False
-        )
+    # OCR引擎池（默认使用进程内共享的引擎池，创建 OCRService 不会加载模型）
+    pool: OCREnginePool
+    def __init__(self, pool: OCREnginePool | None = None):
+        self.pool = pool or get_ocr_pool()
 
     @classmethod
     def _quad_to_rect(cls, box):
@@ -205,54 +565,44 @@ class OCRService:
             ))
         return temp
 
-    def ocr(self, img: np.ndarray):
+    def ocr(self, img: np.ndarray, rec_only: bool = False):
+        """
+        OCR
+        :param img: 图像
+        :param rec_only: 仅识别模式（图像已是紧贴单行文字的裁剪框时使用，跳过文本检测，置信度低时回退到完整OCR）
+        :return: OCR结果列表
+        """
         if img.size == 0:
             logger.warning(f"Empty images or dimensions are illegal: {img.shape if img is not None else 'None'}")
             return []
-        result = self.ocr_engine.ocr(img, cls=False)
-        result = self._map_result_to_ocr_result(result)
-        return OCR_ResultList(result)
+        return OCR_ResultList(_recognize(img, self.pool, rec_only))
 
+    def ocr_batch(self, images: List[np.ndarray], rec_only: bool = False) -> List[OCR_ResultList]:
+        """
+        批量OCR（多张裁剪图共用一次引擎调用）
+        :param images: 图像列表
+        :param rec_only: 仅识别模式，见 ocr
+        :return: 与 images 一一对应的OCR结果列表
+        """
+        return [OCR_ResultList(results) for results in _recognize_batch(images, self.pool, rec_only)]
 
 
-def get_ocr(img: np.array):
+def get_ocr(img: np.array, rec_only: bool = False):
     """
-        获取OCR接口实例
+        获取OCR结果（使用进程内共享的OCR引擎池）
+        rec_only: 仅识别模式，见 OCRService.ocr
     """
 
     if img is None or img.shape[0] == 0 or img.shape[1] == 0:
         logger.warning(f"Empty images or dimensions are illegal: {img.shape if img is not None else 'None'}")
         return []
 
-    def _quad_to_rect(box):
-        """将四边形坐标转换为矩形框(x,y,width,height)"""
-        # 提取所有x和y坐标
-        xs = [p[0] for p in box]
-        ys = [p[1] for p in box]
-
-        # 计算最小外接矩形
-        x = min(xs)
-        y = min(ys)
-        w = max(xs) - x
-        h = max(ys) - y
-
-        return [round(x), round(y), round(w), round(h)]
+    return _recognize(img, get_ocr_pool(), rec_only)
 
-    loader = PaddleOCR(
-        lang='japan',
-        # use_angle_cls=False,
-        show_log=False
-    )
-    result = loader.ocr(img, cls=False)
 
-    if not result or not result[0]:
-        return []
-
-    temp = []
-    for res in result[0]:
-        temp.append(OCR_Result(
-            *_quad_to_rect(res[0]),
-            text=res[1][0],
-            confidence=res[1][1]
-        ))
-    return temp
+def get_ocr_batch(images: List[np.ndarray], rec_only: bool = False) -> List[List[OCR_Result]]:
+    """
+        批量获取OCR结果（多张裁剪图共用一次引擎调用），返回与 images 一一对应的结果
+        rec_only: 仅识别模式，见 OCRService.ocr
+    """
+    return _recognize_batch(images, get_ocr_pool(), rec_only)
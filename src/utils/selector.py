@@ -0,0 +1,220 @@
+"""
+目标框选择器：一种描述目标框查询的小型语言，编译一次后直接在 Yolo_Results 的列上求值。
+
+语法：
+    选择器 := 目标 (关系 标签)* 修饰*
+    目标   := 标签 | *
+    标签   := "带空格的标签" | 常量名（如 button、base_labels.modal_header、producer_labels.item）
+    关系   := below | above | left-of | right-of | inside | contains
+    修饰   := topmost | bottommost | leftmost | rightmost | first
+
+示例：
+    button below "Universal Modal Header" rightmost
+    "General Item" inside card__commodity
+
+多个关系同时满足（与），每个关系只要对任一参照框成立即可；修饰在全部关系之后按书写顺序依次生效。
+裸常量名依次在 base_labels、producer_labels 中查找，找不到时抛出 SelectorSyntaxError（任意标签请加引号）。
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple, Callable, Dict
+
+import numpy as np
+
+from src.constants import base_labels, producer_labels
+from src.entity.Yolo import Yolo_Results
+
+
+class SelectorSyntaxError(ValueError):
+    """选择器语法错误"""
+
+
+def _centers(boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return (boxes[..., 0] + boxes[..., 2]) / 2, (boxes[..., 1] + boxes[..., 3]) / 2
+
+
+# 关系：(目标框 (N, 1, 4), 参照框 (1, M, 4)) → (N, M) 布尔矩阵，坐标为 (x1, y1, x2, y2)
+_RELATIONS: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    # 中心点在参照框下边缘之下
+    "below": lambda box, anchor: _centers(box)[1] >= anchor[..., 3],
+    # 中心点在参照框上边缘之上
+    "above": lambda box, anchor: _centers(box)[1] <= anchor[..., 1],
+    # 中心点在参照框左边缘左侧
+    "left-of": lambda box, anchor: _centers(box)[0] <= anchor[..., 0],
+    # 中心点在参照框右边缘右侧
+    "right-of": lambda box, anchor: _centers(box)[0] >= anchor[..., 2],
+    # 整个框在参照框内
+    "inside": lambda box, anchor: ((box[..., 0] >= anchor[..., 0]) & (box[..., 1] >= anchor[..., 1]) &
+                                   (box[..., 2] <= anchor[..., 2]) & (box[..., 3] <= anchor[..., 3])),
+    # 参照框整个在框内
+    "contains": lambda box, anchor: ((anchor[..., 0] >= box[..., 0]) & (anchor[..., 1] >= box[..., 1]) &
+                                     (anchor[..., 2] <= box[..., 2]) & (anchor[..., 3] <= box[..., 3])),
+}
+
+# 修饰：(坐标列, 取最小值)
+_MODIFIERS: Dict[str, Tuple[int, bool]] = {
+    "topmost": (1, True),
+    "bottommost": (3, False),
+    "leftmost": (0, True),
+    "rightmost": (2, False),
+}
+
+_TOKEN_PATTERN = re.compile(r'\s*(?:"([^"]*)"|\'([^\']*)\'|(\*)|([A-Za-z_][\w.\-]*))')
+
+_LABEL_MODULES = {"base_labels": base_labels, "producer_labels": producer_labels}
+
+
+def _resolve_label(name: str) -> str:
+    """将常量名解析为标签"""
+    if "." in name:
+        module_name, _, attr = name.partition(".")
+        module = _LABEL_MODULES.get(module_name)
+        if module is None or not isinstance(value := getattr(module, attr, None), str):
+            raise SelectorSyntaxError(f"Unknown label constant: {name}")
+        return value
+    for module in _LABEL_MODULES.values():
+        if isinstance(value := getattr(module, name, None), str):
+            return value
+    raise SelectorSyntaxError(f"Unknown label constant: {name} (quote it to use it as a label)")
+
+
+def _tokenize(text: str):
+    """分词，返回 (是否为引号字符串, 内容) 列表"""
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            raise SelectorSyntaxError(f"Unexpected character at {position} in selector: {text!r}")
+        double_quoted, single_quoted, star, word = match.groups()
+        if word is not None:
+            tokens.append((False, word))
+        elif star is not None:
+            tokens.append((False, star))
+        else:
+            tokens.append((True, double_quoted if double_quoted is not None else single_quoted))
+        position = match.end()
+    return tokens
+
+
+@dataclass(frozen=True)
+class Selector:
+    """
+    已编译的选择器。
+
+    Attributes:
+        text: 选择器源文本。
+        target: 目标标签，为None表示全部标签。
+        relations: (关系, 参照标签) 列表。
+        modifiers: 修饰列表。
+    """
+    text: str
+    target: str | None
+    relations: Tuple[Tuple[str, str], ...]
+    modifiers: Tuple[str, ...]
+
+    def __str__(self):
+        return self.text
+
+    def select(self, results: Yolo_Results) -> Yolo_Results:
+        """
+        在检测结果上求值
+        :param results: 检测结果
+        :return: 选中的目标框（保持原有顺序），可能为空
+        """
+        label_index = results._get_label_index()
+        xyxy = results.xyxy
+        if self.target is None:
+            rows = np.arange(len(results))
+        else:
+            rows = np.arange(*label_index.get(self.target, (0, 0)))
+        for relation, label in self.relations:
+            if not len(rows):
+                break
+            anchors = np.arange(*label_index.get(label, (0, 0)))
+            matched = _RELATIONS[relation](xyxy[rows][:, None, :], xyxy[anchors][None, :, :])
+            # 框不以自身作为参照
+            matched &= rows[:, None] != anchors[None, :]
+            rows = rows[matched.any(axis=1)]
+        for modifier in self.modifiers:
+            if not len(rows):
+                break
+            if modifier == "first":
+                rows = rows[:1]
+                continue
+            column, minimum = _MODIFIERS[modifier]
+            values = xyxy[rows, column]
+            rows = rows[[np.argmin(values) if minimum else np.argmax(values)]]
+        return results._take(rows)
+
+    def __call__(self, results: Yolo_Results) -> Yolo_Results:
+        return self.select(results)
+
+
+@lru_cache(maxsize=256)
+def compile_selector(text: str) -> Selector:
+    """
+    编译选择器（按源文本缓存）
+    :param text: 选择器文本
+    :return: Selector
+    """
+    tokens = _tokenize(text)
+    if not tokens:
+        raise SelectorSyntaxError("Empty selector")
+    quoted, value = tokens[0]
+    target = None if (not quoted and value == "*") else (value if quoted else _resolve_label(value))
+    relations = []
+    modifiers = []
+    position = 1
+    while position < len(tokens):
+        quoted, word = tokens[position]
+        if not quoted and word in _RELATIONS and not modifiers:
+            if position + 1 >= len(tokens):
+                raise SelectorSyntaxError(f"Missing label after '{word}' in selector: {text!r}")
+            label_quoted, label = tokens[position + 1]
+            relations.append((word, label if label_quoted else _resolve_label(label)))
+            position += 2
+        elif not quoted and (word in _MODIFIERS or word == "first"):
+            modifiers.append(word)
+            position += 1
+        else:
+            raise SelectorSyntaxError(f"Unexpected token {word!r} in selector: {text!r}")
+    return Selector(text, target, tuple(relations), tuple(modifiers))
+
+
+def as_selector(query: str | Selector) -> Selector | None:
+    """
+    将标签或选择器文本转换为选择器：
+    Selector 原样返回；字符串以引号、* 开头或包含关系、修饰关键字时按选择器编译（语法错误会抛出），
+    否则视为标签名返回None
+    :param query: 标签、选择器文本或已编译的 Selector
+    :return: Selector，标签名返回None
+    """
+    if isinstance(query, Selector):
+        return query
+    try:
+        tokens = _tokenize(query)
+    except SelectorSyntaxError:
+        # 含有选择器不支持的字符（如 "Universal Quantity Select: Added"），只能是标签
+        return None
+    if not tokens:
+        return None
+    quoted, value = tokens[0]
+    if (quoted or value == "*" or any(not quoted and (word in _RELATIONS or word in _MODIFIERS or word == "first")
+                                      for quoted, word in tokens[1:])):
+        return compile_selector(query)
+    return None
+
+
+def select(results: Yolo_Results, selector: str | Selector) -> Yolo_Results:
+    """
+    使用选择器查询检测结果
+    :param results: 检测结果
+    :param selector: 选择器文本或已编译的 Selector
+    :return: 选中的目标框
+    """
+    if isinstance(selector, str):
+        selector = compile_selector(selector)
+    return selector.select(results)
@@ -4,12 +4,16 @@ import cv2
 import numpy as np
 
 from src.constants import *
+from src.core.inference.scope import DetectionScope
 from src.entity.Game.Components.Button import Button
 from src.entity.Game.Components.Modal import Modal
 from src.entity.Yolo import Yolo_Box, Yolo_Results
 from src.utils.ocr_instance import get_ocr
 from src.utils.logger import logger
 
+# 识别模态框所需的标签（调用方通过 AppProcessor.detect 按该范围检测后传入 get_modal）
+MODAL_SCOPE = DetectionScope(labels=(base_labels.modal_header, base_labels.button), name="modal")
+
 @logger.catch
 def get_modal(yolo_result: Yolo_Results, frame: np.array, no_body: bool = False) -> Modal | None:
     """
@@ -25,7 +29,7 @@ def get_modal(yolo_result: Yolo_Results, frame: np.array, no_body: bool = False)
     if not modal:
         raise ValueError("未找到模态框")
     modal_header = modal.filter_by_label(base_labels.modal_header).first()
-    modal_header_text = get_ocr(modal_header.frame)[0].text
+    modal_header_text = get_ocr(modal_header.frame, rec_only=True)[0].text
     # 获取确认和取消按钮
     buttons = modal.filter_by_label(base_labels.button).group_yolo_boxes_by_position(30, None)
     if buttons:
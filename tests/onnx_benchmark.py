@@ -0,0 +1,87 @@
+"""
+对比 torch 与 onnx 推理后端在 CPU 上的单帧延迟及检测结果一致性
+
+用法（在项目根目录下执行）：
+    python -m tests.onnx_benchmark
+"""
+import glob
+import os
+from statistics import mean, median
+from time import perf_counter
+
+import cv2
+import numpy as np
+
+import config
+from src.core.inference.backends import TorchBackend, OnnxBackend
+from src.entity.Yolo import Yolo_Results
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+WARMUP = 3
+REPEAT = 5
+
+
+def load_images():
+    paths = sorted(glob.glob(os.path.join(TESTS_DIR, "**", "*.png"), recursive=True))
+    images = []
+    for path in paths:
+        # 文件名包含中文时 cv2.imread 在 Windows 下会失败
+        image = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is not None:
+            images.append((os.path.relpath(path, TESTS_DIR), image))
+    return images
+
+
+def run(backend, image):
+    return Yolo_Results(backend.predict(image), backend, image)
+
+
+def measure(backend, images):
+    for _ in range(WARMUP):
+        run(backend, images[0][1])
+    latencies = []
+    outputs = []
+    for _, image in images:
+        timings = []
+        for _ in range(REPEAT):
+            start = perf_counter()
+            result = run(backend, image)
+            timings.append((perf_counter() - start) * 1000)
+        latencies.append(median(timings))
+        outputs.append(result)
+    return latencies, outputs
+
+
+def box_signature(results: Yolo_Results):
+    return [(box.label, box.x, box.y, box.w, box.h) for box in results]
+
+
+def is_same(a: Yolo_Results, b: Yolo_Results):
+    return box_signature(a) == box_signature(b)
+
+
+def main():
+    images = load_images()
+    print(f"Images: {len(images)}")
+    for model_type, model_config in config.model_config.items():
+        torch_backend = TorchBackend(model_type, model_config, "cpu").load()
+        onnx_backend = OnnxBackend(model_type, model_config, "cpu").load()
+        torch_latencies, torch_outputs = measure(torch_backend, images)
+        onnx_latencies, onnx_outputs = measure(onnx_backend, images)
+        mismatches = [
+            name for (name, _), a, b in zip(images, torch_outputs, onnx_outputs) if not is_same(a, b)
+        ]
+
+        print(f"\n[{model_type}] imgsz={torch_backend.imgsz}")
+        print(f"{'backend':<8}{'mean(ms)':>12}{'median(ms)':>12}{'p95(ms)':>12}")
+        for name, latencies in (("torch", torch_latencies), ("onnx", onnx_latencies)):
+            p95 = float(np.percentile(latencies, 95))
+            print(f"{name:<8}{mean(latencies):>12.2f}{median(latencies):>12.2f}{p95:>12.2f}")
+        print(f"speedup: {mean(torch_latencies) / mean(onnx_latencies):.2f}x")
+        print(f"identical results: {len(images) - len(mismatches)}/{len(images)}")
+        for name in mismatches:
+            print(f"  mismatch: {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import unittest
+
+import numpy as np
+
+from src.constants import base_labels
+from src.entity.Yolo import Yolo_Box, Yolo_Results
+from src.utils.selector import SelectorSyntaxError, as_selector, compile_selector
+
+HEADER = base_labels.modal_header
+BUTTON = base_labels.button
+
+
+def _results(*boxes) -> Yolo_Results:
+    """由 (x1, y1, x2, y2, label) 构建检测结果"""
+    frame = np.zeros((400, 400, 3), dtype=np.uint8)
+    return Yolo_Results.from_boxes([Yolo_Box(x1, y1, x2, y2, label, None, source=frame)
+                                    for x1, y1, x2, y2, label in boxes])
+
+
+def _coords(results: Yolo_Results) -> list:
+    return [tuple(row) for row in results.xyxy.tolist()]
+
+
+class CompileSelectorTest(unittest.TestCase):
+    def test_resolves_constants_and_quoted_labels(self):
+        selector = compile_selector('button below base_labels.modal_header rightmost')
+        self.assertEqual(selector.target, BUTTON)
+        self.assertEqual(selector.relations, (("below", HEADER),))
+        self.assertEqual(selector.modifiers, ("rightmost",))
+        selector = compile_selector('"Some Label" inside \'Other Label\'')
+        self.assertEqual(selector.target, "Some Label")
+        self.assertEqual(selector.relations, (("inside", "Other Label"),))
+
+    def test_star_target(self):
+        self.assertIsNone(compile_selector("* inside button").target)
+
+    def test_unknown_bare_label_raises(self):
+        with self.assertRaises(SelectorSyntaxError):
+            compile_selector("buton below button")
+        with self.assertRaises(SelectorSyntaxError):
+            compile_selector("button below base_labels.not_a_label")
+
+    def test_syntax_errors(self):
+        for text in ["", "button below", "button rightmost below button", "button sideways button",
+                     "button : button"]:
+            with self.subTest(text=text), self.assertRaises(SelectorSyntaxError):
+                compile_selector(text)
+
+    def test_compiled_selector_is_cached(self):
+        self.assertIs(compile_selector("button topmost"), compile_selector("button topmost"))
+
+
+class AsSelectorTest(unittest.TestCase):
+    def test_plain_labels_are_not_selectors(self):
+        self.assertIsNone(as_selector(BUTTON))
+        self.assertIsNone(as_selector(base_labels.tab_home))
+        self.assertIsNone(as_selector("Universal Quantity Select: Added"))
+
+    def test_selector_text(self):
+        self.assertEqual(as_selector("button below button").relations, (("below", BUTTON),))
+        self.assertEqual(as_selector('"Universal button" first').modifiers, ("first",))
+        selector = compile_selector("button")
+        self.assertIs(as_selector(selector), selector)
+
+    def test_invalid_selector_text_raises(self):
+        with self.assertRaises(SelectorSyntaxError):
+            as_selector("buton below button")
+
+
+class SelectTest(unittest.TestCase):
+    def setUp(self):
+        self.results = _results(
+            (100, 50, 300, 90, HEADER),
+            (120, 200, 180, 240, BUTTON),
+            (220, 200, 280, 240, BUTTON),
+            (220, 20, 280, 40, BUTTON),
+            (90, 40, 310, 300, "Panel"),
+        )
+
+    def test_relation(self):
+        below = self.results.select("button below base_labels.modal_header")
+        self.assertEqual(_coords(below), [(120, 200, 180, 240), (220, 200, 280, 240)])
+        self.assertEqual(_coords(self.results.select("button above base_labels.modal_header")),
+                         [(220, 20, 280, 40)])
+
+    def test_relations_are_combined_with_and(self):
+        selected = self.results.select('button inside "Panel" below base_labels.modal_header')
+        self.assertEqual(len(selected), 2)
+        self.assertFalse(self.results.select('button inside "Panel" above base_labels.modal_header'))
+
+    def test_modifiers_apply_after_relations(self):
+        # rightmost 在 below 筛选之后生效，上方按钮虽然同样靠右也不会被选中
+        selected = self.results.select("button below base_labels.modal_header rightmost")
+        self.assertEqual(_coords(selected), [(220, 200, 280, 240)])
+
+    def test_modifiers_apply_in_order(self):
+        # 每个修饰都只保留一个框，书写顺序不同结果不同
+        self.assertEqual(_coords(self.results.select("button bottommost rightmost")), [(120, 200, 180, 240)])
+        self.assertEqual(_coords(self.results.select("button rightmost bottommost")), [(220, 20, 280, 40)])
+
+    def test_box_is_not_its_own_anchor(self):
+        self.assertEqual(_coords(self.results.select("button below button")),
+                         [(120, 200, 180, 240), (220, 200, 280, 240)])
+
+    def test_star_and_missing_labels(self):
+        self.assertEqual(len(self.results.select('* inside "Panel"')), 3)
+        self.assertFalse(self.results.select('"Missing" below button'))
+        self.assertFalse(self.results.select('button below "Missing"'))
+
+    def test_select_accepts_compiled_selector(self):
+        selector = compile_selector("button leftmost")
+        self.assertEqual(_coords(self.results.select(selector)), [(120, 200, 180, 240)])
+
+
+if __name__ == "__main__":
+    unittest.main()
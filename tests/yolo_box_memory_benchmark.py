@@ -0,0 +1,119 @@
+"""
+Yolo_Box / OCR_Result / Button 内存与分配基准：模拟一小时的检测结果更替，
+对比 __slots__ 布局与普通 __dict__ 布局的单实例大小、创建耗时和峰值内存
+
+用法（在项目根目录下执行）：
+    python -m tests.yolo_box_memory_benchmark
+"""
+import random
+import sys
+import tracemalloc
+import weakref
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+
+from src.entity.Game.Components.Button import Button
+from src.entity.Yolo import Yolo_Box
+from src.utils.ocr_instance import OCR_Result
+
+# 模拟时长（秒）及帧率（任务执行中的目标帧率）
+SIMULATED_SECONDS = 3600
+FPS = 10
+BOXES_PER_FRAME = 25
+OCR_RESULTS_PER_FRAME = 10
+BUTTONS_PER_FRAME = 3
+# 同时存活的帧数（帧快照环形缓冲区容量）
+LIVE_FRAMES = 30
+FRAME_SIZE = (1920, 1080)
+SEED = 0
+
+
+class DictRecord:
+    """对照组：与被测类属性相同的普通 __dict__ 对象"""
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+def instance_size(obj) -> int:
+    """实例本身及其 __dict__ 的大小（不含属性值）"""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def attributes_of(obj) -> dict:
+    names = [name for cls in type(obj).__mro__ for name in getattr(cls, "__slots__", ())]
+    return {name: getattr(obj, name) for name in names}
+
+
+def make_frame_objects(rng: random.Random, frame: np.ndarray, slotted: bool) -> list:
+    """创建一帧的检测框、OCR结果和按钮（对照组直接创建属性相同的 DictRecord）"""
+    objects = []
+    for index in range(BOXES_PER_FRAME):
+        x1, y1 = rng.randint(0, FRAME_SIZE[0] - 200), rng.randint(0, FRAME_SIZE[1] - 200)
+        x2, y2 = x1 + rng.randint(20, 200), y1 + rng.randint(20, 200)
+        if slotted:
+            box = Yolo_Box(x1, y1, x2, y2, "button", None, source=frame)
+            objects.append(box)
+            if index < BUTTONS_PER_FRAME:
+                objects.append(Button(box, no_text=True))
+        else:
+            attributes = dict(x=x1, y=y1, w=x2, h=y2, label="button", cx=(x1 + x2) // 2, cy=(y1 + y2) // 2,
+                              model_type=None, track_id=None, _crop=None, _source=weakref.ref(frame))
+            objects.append(DictRecord(**attributes))
+            if index < BUTTONS_PER_FRAME:
+                objects.append(DictRecord(**attributes, text=None))
+    for _ in range(OCR_RESULTS_PER_FRAME):
+        x, y, w, h = rng.randint(0, 200), rng.randint(0, 50), rng.randint(10, 80), rng.randint(10, 30)
+        confidence = rng.random()
+        if slotted:
+            objects.append(OCR_Result(x, y, w, h, "テキスト", confidence))
+        else:
+            objects.append(DictRecord(x=x, y=y, w=w, h=h, cx=x + w / 2, cy=y + h / 2, text="テキスト",
+                                      confidence=confidence))
+    return objects
+
+
+def simulate(slotted: bool):
+    """模拟一小时的结果更替，返回 (耗时秒, 峰值内存MB, 创建对象数)"""
+    rng = random.Random(SEED)
+    frame = np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+    live = deque(maxlen=LIVE_FRAMES)
+    created = 0
+    tracemalloc.start()
+    start = perf_counter()
+    for _ in range(SIMULATED_SECONDS * FPS):
+        objects = make_frame_objects(rng, frame, slotted)
+        created += len(objects)
+        live.append(objects)
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, created
+
+
+def main():
+    frame = np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+    box = Yolo_Box(10, 10, 110, 60, "button", None, source=frame)
+    samples = {
+        "Yolo_Box": box,
+        "OCR_Result": OCR_Result(10, 10, 100, 20, "テキスト", 0.99),
+        "Button": Button(box, no_text=True),
+    }
+    print(f"{'class':<12}{'slots(B)':>10}{'dict(B)':>10}")
+    for name, obj in samples.items():
+        print(f"{name:<12}{instance_size(obj):>10}{instance_size(DictRecord(**attributes_of(obj))):>10}")
+
+    print(f"\nSimulating {SIMULATED_SECONDS}s at {FPS} fps, {LIVE_FRAMES} frames alive")
+    print(f"{'layout':<8}{'objects':>12}{'time(s)':>10}{'peak(MB)':>10}")
+    for layout, slotted in (("slots", True), ("dict", False)):
+        elapsed, peak, created = simulate(slotted)
+        print(f"{layout:<8}{created:>12}{elapsed:>10.2f}{peak:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Yolo_Results 几何查询微基准：对比空间索引实现与逐框扫描的耗时，并校验结果一致
+
+用法（在项目根目录下执行）：
+    python -m tests.yolo_query_benchmark
+"""
+import random
+from statistics import median
+from time import perf_counter
+
+import numpy as np
+
+from src.entity.Yolo import Yolo_Box, Yolo_Results
+
+SIZES = (10, 100, 500, 1000, 2000)
+FRAME_SIZE = (1920, 1080)
+LABELS = ["button", "item", "skill card", "panel", "icon"]
+REPEAT = 20
+SEED = 0
+
+
+def make_boxes(count: int, rng: random.Random):
+    """生成随机目标框（注意 Yolo_Box 的 w/h 实际存放 x2/y2）"""
+    frame = np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+    boxes = []
+    for _ in range(count):
+        label = rng.choice(LABELS)
+        size = rng.randint(200, 600) if label == "panel" else rng.randint(20, 160)
+        x1 = rng.randint(0, FRAME_SIZE[0] - size)
+        y1 = rng.randint(0, FRAME_SIZE[1] - size)
+        x2, y2 = x1 + size, y1 + rng.randint(size // 2, size)
+        boxes.append(Yolo_Box(x1, y1, x2, y2, label, frame[y1:y2, x1:x2]))
+    return boxes
+
+
+# ===== 逐框扫描的参考实现 =====
+
+def naive_center_x_range(boxes, x_value, range_):
+    return [box for box in boxes if box.cx - range_ <= x_value <= box.cx + range_]
+
+
+def naive_y_range(boxes, y_value, range_):
+    return [box for box in boxes if box.cy - range_ <= y_value <= box.cy + range_]
+
+
+def naive_match_rows(boxes, other_boxes, tolerance_ratio=0.5):
+    return [
+        (box1, box2) for box1 in boxes for box2 in other_boxes
+        if abs(box1.y - box2.y) <= min(box1.h, box2.h) * tolerance_ratio
+    ]
+
+
+def naive_containing_groups(boxes, container_label, include_labels):
+    groups = []
+    for container in boxes:
+        if container.label != container_label:
+            continue
+        included = [
+            other for other in boxes
+            if other != container and other.label in include_labels
+            and container.x <= other.x and container.y <= other.y
+            and container.x + container.w >= other.x + other.w
+            and container.y + container.h >= other.y + other.h
+        ]
+        if included:
+            groups.append([container] + included)
+    return groups
+
+
+def build(boxes):
+    results = Yolo_Results.from_boxes(boxes)
+    for axis in ("x1", "y1", "cx", "cy"):
+        results._get_axis(axis)
+    return results
+
+
+def timeit(func):
+    timings = []
+    result = None
+    for _ in range(REPEAT):
+        start = perf_counter()
+        result = func()
+        timings.append((perf_counter() - start) * 1000)
+    return median(timings), result
+
+
+def signature(boxes):
+    return sorted((box.label, box.x, box.y, box.w, box.h) for box in boxes)
+
+
+def main():
+    rng = random.Random(SEED)
+    print(f"{'boxes':>6}  {'query':<18}{'scan(ms)':>10}{'index(ms)':>11}{'speedup':>9}  ok")
+    for count in SIZES:
+        boxes = make_boxes(count, rng)
+        x_value, y_value = FRAME_SIZE[0] // 2, FRAME_SIZE[1] // 2
+        others = boxes[:20]
+        # 构建结果与空间索引的开销单独统计，查询计时使用已构建索引的结果
+        build_ms, results = timeit(lambda: build(boxes))
+        print(f"{count:>6}  {'build':<18}{'':>10}{build_ms:>11.3f}")
+        cases = [
+            ("center_x_range",
+             lambda: naive_center_x_range(boxes, x_value, 40),
+             lambda: results.get_center_x_range_element(x_value, 40).boxes,
+             signature),
+            ("y_range",
+             lambda: naive_y_range(boxes, y_value, 40),
+             lambda: results.get_y_range_element(y_value, 40).boxes,
+             signature),
+            ("match_rows",
+             lambda: naive_match_rows(boxes, others),
+             lambda: results.match_rows_with(others),
+             lambda pairs: sorted(signature(pair) for pair in pairs)),
+            ("containing_groups",
+             lambda: naive_containing_groups(boxes, "panel", ["button", "icon"]),
+             lambda: [group.boxes for group in
+                      results.find_containing_groups("panel", ["button", "icon"], "or")],
+             lambda groups: sorted(signature(group) for group in groups)),
+        ]
+        for name, naive, indexed, normalize in cases:
+            naive_ms, naive_result = timeit(naive)
+            index_ms, index_result = timeit(indexed)
+            ok = normalize(naive_result) == normalize(index_result)
+            speedup = naive_ms / index_ms if index_ms else float("inf")
+            print(f"{count:>6}  {name:<18}{naive_ms:>10.3f}{index_ms:>11.3f}{speedup:>8.1f}x  {'yes' if ok else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+
+from src.entity.Yolo import Yolo_Box, Yolo_Results
+
+
+def _results(*labels) -> Yolo_Results:
+    frame = np.zeros((100, 100, 3), dtype=np.uint8)
+    return Yolo_Results.from_boxes([Yolo_Box(i * 10, 0, i * 10 + 5, 5, label, None, source=frame)
+                                    for i, label in enumerate(labels)])
+
+
+class LabelExistsTest(unittest.TestCase):
+    # 标签位是进程内全局注册的，每个用例使用此前从未出现过的标签
+
+    def test_exists_label_on_fresh_results(self):
+        results = _results("Fresh Exists A")
+        self.assertTrue(results.exists_label("Fresh Exists A"))
+        self.assertFalse(results.exists_label("Fresh Exists Missing"))
+
+    def test_exists_all_labels_on_fresh_results(self):
+        results = _results("Fresh All A", "Fresh All B")
+        self.assertTrue(results.exists_all_labels(["Fresh All A", "Fresh All B"]))
+        self.assertFalse(results.exists_all_labels(["Fresh All A", "Fresh All Missing"]))
+
+    def test_derived_results(self):
+        results = _results("Fresh Derived A", "Fresh Derived B")
+        derived = results.filter_by_label("Fresh Derived B")
+        self.assertTrue(derived.exists_label("Fresh Derived B"))
+        self.assertFalse(derived.exists_label("Fresh Derived A"))
+
+
+if __name__ == "__main__":
+    unittest.main()